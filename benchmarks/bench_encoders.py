@@ -0,0 +1,73 @@
+"""Per-response JSON encoding benchmarks.
+
+Run with "pytest-benchmark":
+
+    python -m pytest benchmarks/bench_encoders.py --benchmark-only
+"""
+from flask import Flask, jsonify
+
+import pytest
+
+from resourceful.encoders import ENCODERS, get_encoder
+
+
+def make_resource(index):
+    return {
+        'id': str(index),
+        'type': 'users',
+        'attributes': {
+            'first-name': 'George',
+            'last-name': 'Michael',
+            'email': 'user{}@example.com'.format(index),
+            'is-archived': False,
+            'login-count': index * 7,
+            'created-at': '2017-01-01T00:00:00+00:00',
+        },
+        'relationships': {
+            'account': {'data': {'id': str(index % 10), 'type': 'accounts'}},
+        },
+        'links': {'self': '/users/{}'.format(index)},
+    }
+
+
+def make_document(size):
+    if size == 1:
+        return {'data': make_resource(1)}
+    return {
+        'data': [make_resource(index) for index in range(size)],
+        'included': [
+            {'id': str(index), 'type': 'accounts',
+             'attributes': {'name': 'Account {}'.format(index)}}
+            for index in range(10)],
+        'links': {'self': '/users?page[offset]=0&page[limit]={}'.format(size)},
+        'meta': {'total': size * 10},
+    }
+
+
+def available_encoders():
+    names = []
+    for name in ENCODERS:
+        try:
+            get_encoder(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+@pytest.mark.parametrize('size', [1, 100, 1000])
+@pytest.mark.parametrize('name', available_encoders())
+def test_encoder(benchmark, name, size):
+    encoder = get_encoder(name)
+    document = make_document(size)
+    benchmark.group = 'encode-{}'.format(size)
+    benchmark(encoder.dumps, document)
+
+
+@pytest.mark.parametrize('size', [1, 100, 1000])
+def test_flask_jsonify(benchmark, size):
+    app = Flask(__name__)
+    document = make_document(size)
+    benchmark.group = 'encode-{}'.format(size)
+    with app.app_context():
+        benchmark(lambda: jsonify(document).get_data())
@@ -0,0 +1,117 @@
+"""End-to-end Flask request benchmarks."""
+from flask import Flask
+
+import pytest
+
+from resourceful.decorators import post_dump, post_fetch, pre_fetch
+from resourceful.extensions.flask import (
+    FlaskResourceful, FlaskResourcefulView)
+from resourceful.views import ReadView, UpdateView
+
+
+ROUTES = 300
+
+
+def make_app(database, serializer):
+    class UsersView(FlaskResourcefulView, ReadView):
+
+        def dispatch_request(self, **uri_args):
+            query = self.interleave('pre_fetch', self.query, **uri_args)
+            models = self.fetch(query)
+            models = self.interleave('post_fetch', models)
+            data = self.dump(models)
+            data = self.interleave('post_dump', data)
+            return self.send_response(data, self._code)
+
+        @pre_fetch
+        def exclude_archived(self, query, **uri_args):
+            return query + ' WHERE is_archived = 0'
+
+        @post_fetch
+        def check_permissions(self, models):
+            self['checked'] = True
+            return models
+
+        @post_dump
+        def add_meta(self, response):
+            response['meta'] = {'checked': self['checked']}
+            return response
+
+    class BrowseUsersView(UsersView):
+        query = 'SELECT * FROM users'
+
+        @pre_fetch(-1)
+        def paginate(self, query, **uri_args):
+            return query + ' LIMIT 100'
+
+        def fetch(self, query):
+            return database.execute(query).fetchall()
+
+        def dump(self, models):
+            return serializer.serialize_all(models)
+
+    class DetailUserView(UsersView):
+        query = 'SELECT * FROM users'
+
+        @pre_fetch(-1)
+        def filter_by_id(self, query, id):
+            return query + ' AND id = {:d}'.format(int(id))
+
+        def fetch(self, query):
+            return database.execute(query).fetchone()
+
+        def dump(self, model):
+            return serializer.serialize(model)
+
+    app = Flask(__name__)
+    api = FlaskResourceful()
+    api.init_app(app)
+    api.add_views('/users', [BrowseUsersView])
+    api.add_views('/users/<id>', [DetailUserView])
+    return app
+
+
+@pytest.fixture(scope='module')
+def client(database, serializer):
+    return make_app(database, serializer).test_client()
+
+
+@pytest.mark.parametrize('url', ['/users/1', '/users'])
+def test_request(benchmark, client, url):
+    benchmark.group = 'flask-request'
+    response = benchmark(client.get, url)
+    assert response.status_code == 200
+
+
+def make_routing_app(merge_routes):
+    class DetailView(FlaskResourcefulView, ReadView):
+
+        def dispatch_request(self, id):
+            return self.send_response({'data': {'id': id}}, self._code)
+
+    class UpdateDetailView(FlaskResourcefulView, UpdateView):
+
+        def dispatch_request(self, id):
+            return self.send_response({}, self._code)
+
+    app = Flask(__name__)
+    api = FlaskResourceful(merge_routes=merge_routes)
+    api.init_app(app)
+    api.add_routes(
+        ('/resource{}/<id>'.format(index), [DetailView, UpdateDetailView])
+        for index in range(ROUTES))
+    return app
+
+
+@pytest.mark.parametrize('merge_routes', [False, True])
+def test_register_routes(benchmark, merge_routes):
+    benchmark.group = 'flask-register-routes'
+    benchmark(make_routing_app, merge_routes)
+
+
+@pytest.mark.parametrize('merge_routes', [False, True])
+def test_match_route(benchmark, merge_routes):
+    adapter = make_routing_app(merge_routes).url_map.bind('localhost')
+    url = '/resource{}/1'.format(ROUTES - 1)
+    benchmark.group = 'flask-match-route'
+    benchmark(adapter.match, url, 'PUT')
@@ -0,0 +1,43 @@
+"""jsonapiquery mixin benchmarks."""
+import pytest
+
+jsonapi = pytest.importorskip('resourceful.extensions.jsonapi')
+
+
+class JSONAPIQuery:
+    """Stand-in for "jsonapiquery.JSONAPIQuery" over SQLite query strings."""
+
+    def filter(self, query, errors):
+        return query + ' WHERE is_archived = 0', []
+
+    def sort(self, query, errors):
+        return query + ' ORDER BY id', []
+
+    def paginate(self, query, errors):
+        return query + ' LIMIT 100', 10000, []
+
+    def make_paginated_response(self, response, url, total):
+        response['links'] = {'self': url}
+        response['meta'] = {'total': total}
+        return response
+
+
+class UsersView(jsonapi.QueryMixin):
+    jsonapi = JSONAPIQuery()
+    pagination_url = '/users'
+    query_options = {'may_include': False}
+
+    def raise_jsonapi_errors(self, errors):
+        raise ValueError(errors)
+
+
+def test_query_mixin(benchmark, database, serializer):
+    view = UsersView()
+
+    def request():
+        query = view.apply_jsonapi_args('SELECT * FROM users')
+        response = serializer.serialize_all(database.execute(query))
+        return view.paginate_response(view.compound_response(response))
+
+    benchmark.group = 'jsonapi'
+    benchmark(request)
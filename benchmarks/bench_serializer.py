@@ -0,0 +1,125 @@
+"""Serializer benchmarks."""
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from conftest import UserSerializer
+
+import pytest
+
+
+class ParallelUserSerializer(UserSerializer):
+    """Serialize plain-data chunks of "users" rows on a worker pool."""
+
+    parallel_threshold = 0
+
+    def prepare_chunk(self, models):
+        return [dict(row) for row in models]
+
+
+@pytest.mark.parametrize('size', [1, 100, 10000])
+def test_serialize_all(benchmark, database, serializer, size):
+    rows = database.execute(
+        'SELECT * FROM users LIMIT ?', (size, )).fetchall()
+    benchmark.group = 'serialize-all'
+    benchmark(serializer.serialize_all, rows)
+
+
+@pytest.mark.parametrize('cached', [False, True])
+def test_make_schema(benchmark, cached):
+    marshmallow = pytest.importorskip('marshmallow')
+    from resourceful.serializer import SchemaCache, Serializer
+
+    class UserSchema(marshmallow.Schema):
+        id = marshmallow.fields.Integer()
+        first_name = marshmallow.fields.String()
+        last_name = marshmallow.fields.String()
+        email = marshmallow.fields.String()
+
+    class SchemaSerializer(Serializer):
+        schema = UserSchema
+        schema_cache = SchemaCache()
+
+        def serialize(self, model, many=False, **schema_args):
+            return
+
+        def deserialize(self, form, many=False, **schema_args):
+            return
+
+    serializer = SchemaSerializer()
+    make = serializer.make_schema if cached else serializer.create_schema
+    benchmark.group = 'make-schema'
+    benchmark(make, ('id', 'email'), True)
+
+
+@pytest.fixture(scope='module', params=['serial', 'thread', 'process'])
+def parallel_serializer(request):
+    executors = {'thread': ThreadPoolExecutor, 'process': ProcessPoolExecutor}
+    serializer = ParallelUserSerializer()
+    if request.param in executors:
+        serializer.parallel_executor = executors[request.param](4)
+    yield request.param, serializer
+    if serializer.parallel_executor is not None:
+        serializer.parallel_executor.shutdown()
+
+
+@pytest.mark.parametrize('size', [100, 1000, 5000, 10000])
+def test_serialize_all_parallel(benchmark, database, parallel_serializer,
+                                size):
+    """Find the collection size where a worker pool pays off."""
+    mode, serializer = parallel_serializer
+    rows = database.execute(
+        'SELECT * FROM users LIMIT ?', (size, )).fetchall()
+    serializer.parallel_chunk_size = max(size // 4, 1)
+    benchmark.group = 'serialize-all-parallel-{}'.format(size)
+    benchmark.extra_info['mode'] = mode
+    benchmark(serializer.serialize_all, rows)
+
+
+def make_forms(size):
+    return [
+        {'data': {'type': 'users', 'attributes': {
+            'first-name': 'George', 'last-name': 'Michael',
+            'email': 'user{}@example.com'.format(index), 'age': 30,
+            'is-archived': False, 'unknown': index}}}
+        for index in range(size)]
+
+
+@pytest.mark.parametrize('size', [1, 1000])
+def test_deserialize_compiled(benchmark, size):
+    from resourceful.compiled import CompiledSerializer, Field
+
+    class UserSerializer(CompiledSerializer):
+        fields = {
+            'first-name': Field(str, required=True),
+            'last-name': Field(str, required=True),
+            'email': Field(str, required=True, validate=lambda v: '@' in v),
+            'age': Field(int),
+            'is-archived': Field(bool, default=False),
+        }
+
+    benchmark.group = 'deserialize-{}'.format(size)
+    benchmark(UserSerializer().deserialize_all, make_forms(size))
+
+
+@pytest.mark.parametrize('size', [1, 1000])
+def test_deserialize_marshmallow(benchmark, size):
+    marshmallow = pytest.importorskip('marshmallow')
+    fields = marshmallow.fields
+
+    class UserSchema(marshmallow.Schema):
+        class Meta:
+            unknown = marshmallow.EXCLUDE
+
+        first_name = fields.String(data_key='first-name', required=True)
+        last_name = fields.String(data_key='last-name', required=True)
+        email = fields.String(
+            required=True, validate=lambda value: '@' in value)
+        age = fields.Integer(strict=True)
+        is_archived = fields.Boolean(
+            data_key='is-archived', load_default=False)
+
+    schema = UserSchema(many=True)
+
+    def deserialize_all(forms):
+        return schema.load([form['data']['attributes'] for form in forms])
+
+    benchmark.group = 'deserialize-{}'.format(size)
+    benchmark(deserialize_all, make_forms(size))
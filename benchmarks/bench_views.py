@@ -0,0 +1,36 @@
+"""Processor resolution and interleave benchmarks."""
+import pytest
+
+from resourceful.decorators import tag_processor
+from resourceful.views import View, resolve_processors
+
+
+def make_view(attributes, processors, compiled=False):
+    """Return a view class with "processors" tagged "pre_fetch" methods.
+
+    The remaining attributes are plain methods so resolution cost can
+    be measured against class size.
+    """
+    namespace = {'compiled_dispatch': compiled}
+    for index in range(attributes):
+        def method(self, arg, **kwargs):
+            return arg
+        if index < processors:
+            method = tag_processor(index, 'pre_fetch')(method)
+        namespace['method_{}'.format(index)] = method
+    return type('BenchmarkView', (View, ), namespace)
+
+
+@pytest.mark.parametrize('attributes', [10, 100, 1000])
+def test_resolve_processors(benchmark, attributes):
+    view = make_view(attributes, attributes // 10)
+    benchmark.group = 'resolve-processors'
+    benchmark(resolve_processors, view)
+
+
+@pytest.mark.parametrize('length', [0, 1, 4, 16])
+@pytest.mark.parametrize('compiled', [False, True], ids=['loop', 'compiled'])
+def test_interleave(benchmark, length, compiled):
+    view = make_view(length, length, compiled)()
+    benchmark.group = 'interleave-{}'.format(length)
+    benchmark(view.interleave, 'pre_fetch', None, id=1)
@@ -0,0 +1,81 @@
+"""Benchmark suite for the view and serializer request path.
+
+Install "pytest-benchmark" and run from the repository root:
+
+    python -m pytest benchmarks --benchmark-autosave
+
+Results are saved as JSON under ".benchmarks/" together with the
+commit they were taken at.  Compare two runs with:
+
+    python -m pytest benchmarks --benchmark-compare=0001 \\
+        --benchmark-compare-fail=mean:10%
+
+or write a single run to a known path with "--benchmark-json=FILE".
+The database is an in-memory SQLite stand-in so runs are
+reproducible and free of network latency.
+"""
+import pytest
+import sqlite3
+
+from resourceful.serializer import Serializer
+
+
+ROWS = 10000
+
+
+def make_database(rows=ROWS):
+    """Return an in-memory SQLite database with a "users" table."""
+    connection = sqlite3.connect(':memory:', check_same_thread=False)
+    connection.row_factory = sqlite3.Row
+    connection.execute(
+        'CREATE TABLE users (id INTEGER PRIMARY KEY, first_name TEXT, '
+        'last_name TEXT, email TEXT, is_archived INTEGER, account_id INTEGER)')
+    connection.executemany(
+        'INSERT INTO users VALUES (?, ?, ?, ?, ?, ?)',
+        ((index, 'George', 'Michael', 'user{}@example.com'.format(index), 0,
+          index % 10) for index in range(1, rows + 1)))
+    connection.commit()
+    return connection
+
+
+class UserSerializer(Serializer):
+    """JSONAPI-shaped serializer for "users" rows."""
+
+    def deserialize(self, form, many=False, **schema_args):
+        if many:
+            return [item['data']['attributes'] for item in form]
+        return form['data']['attributes']
+
+    def serialize(self, model, many=False, **schema_args):
+        if many:
+            return {'data': [self.serialize_one(row) for row in model]}
+        return {'data': self.serialize_one(model)}
+
+    def serialize_one(self, row):
+        return {
+            'id': str(row['id']),
+            'type': 'users',
+            'attributes': {
+                'first-name': row['first_name'],
+                'last-name': row['last_name'],
+                'email': row['email'],
+                'is-archived': bool(row['is_archived']),
+            },
+            'relationships': {
+                'account': {
+                    'data': {'id': str(row['account_id']), 'type': 'accounts'}
+                }
+            },
+        }
+
+
+@pytest.fixture(scope='session')
+def database():
+    connection = make_database()
+    yield connection
+    connection.close()
+
+
+@pytest.fixture(scope='session')
+def serializer():
+    return UserSerializer()
@@ -1,4 +1,54 @@
-from resourceful.decorators import *
-from resourceful.errors import *
-from resourceful.serializer import *
-from resourceful.views import *
+"""REST API framework.
+
+Public names are loaded on first access so importing the package only
+pays for the modules a process actually uses.
+"""
+import importlib
+
+
+_EXPORTS = {
+    'resourceful.decorators': (
+        'after_response', 'independent', 'post_archive_all', 'post_dump',
+        'post_dump_chunk', 'post_fetch', 'post_load', 'post_save',
+        'post_save_all', 'pre_archive_all', 'pre_dump', 'pre_fetch',
+        'pre_load', 'pre_save', 'pre_save_all', 'tag_processor'),
+    'resourceful.errors': ('ResourceError', 'ValidationError'),
+    'resourceful.serializer': (
+        'SchemaCache', 'Serializer', 'get_serializer', 'qualified_name',
+        'resolve_serializer'),
+    'resourceful.compiled': ('CompiledSerializer', 'Field'),
+    'resourceful.views': (
+        'ArchiveView', 'BulkCreateView', 'BulkDeleteView', 'BulkMixin',
+        'BulkUpdateView', 'CreateView', 'DeleteMixin', 'DeleteView',
+        'PartialUpdateView', 'ReadView', 'UpdateView', 'View',
+        'resolve_processors'),
+    'resourceful.aio': (
+        'AsyncArchiveView', 'AsyncCreateView', 'AsyncDeleteView',
+        'AsyncPartialUpdateView', 'AsyncReadView', 'AsyncUpdateView',
+        'AsyncView'),
+}
+_MODULES = {
+    name: module for module, names in _EXPORTS.items() for name in names}
+_SUBMODULES = (
+    'aio', 'cache', 'compiled', 'context', 'decorators', 'encoders',
+    'errors', 'extensions', 'instrumentation', 'loader', 'pipeline',
+    'serializer', 'tasks', 'views')
+
+__all__ = tuple(_MODULES)
+
+
+def __getattr__(name):
+    """Import and cache a public name or submodule on first access."""
+    if name in _MODULES:
+        value = getattr(importlib.import_module(_MODULES[name]), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module('resourceful.' + name)
+    else:
+        raise AttributeError(
+            'module {!r} has no attribute {!r}'.format(__name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
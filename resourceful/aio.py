@@ -0,0 +1,80 @@
+"""Asynchronous view module."""
+from resourceful.views import (
+    ArchiveView, CreateView, DeleteView, PartialUpdateView, ReadView,
+    UpdateView, View)
+
+import asyncio
+import inspect
+
+
+class AsyncView(View):
+    """Asynchronous view class.
+
+    "interleave" is a coroutine.  Coroutine processors are awaited and
+    synchronous processors run in line.  Consecutive processors marked
+    with "resourceful.independent" are run concurrently.  Compiled
+    dispatch and instrumentation are not supported.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        if cls.compiled_dispatch:
+            raise TypeError(
+                'Compiled dispatch is not supported by asynchronous views.')
+        super().__init_subclass__(**kwargs)
+
+    async def interleave(self, name, arg, **kwargs):
+        independent = []
+        for processor in self.processors[name]:
+            if getattr(processor, '__invokation_independent__', False):
+                independent.append(processor)
+                continue
+            if independent:
+                await self.gather(independent, arg, **kwargs)
+                independent = []
+            arg = processor(self, arg, **kwargs)
+            if inspect.isawaitable(arg):
+                arg = await arg
+        if independent:
+            await self.gather(independent, arg, **kwargs)
+        return arg
+
+    async def gather(self, processors, arg, **kwargs):
+        """Run a set of processors concurrently and discard the results."""
+        results = [processor(self, arg, **kwargs) for processor in processors]
+        await asyncio.gather(
+            *[result for result in results if inspect.isawaitable(result)])
+
+
+class AsyncReadView(AsyncView, ReadView):
+    """Asynchronous resource read view."""
+
+
+class AsyncCreateView(AsyncView, CreateView):
+    """Asynchronous resource create view."""
+
+
+class AsyncUpdateView(AsyncView, UpdateView):
+    """Asynchronous resource update view."""
+
+
+class AsyncPartialUpdateView(AsyncView, PartialUpdateView):
+    """Asynchronous resource partial update view."""
+
+
+class AsyncArchiveView(AsyncView, ArchiveView):
+    """Asynchronous resource archive view."""
+
+
+class AsyncDeleteView(AsyncView, DeleteView):
+    """Asynchronous resource delete view."""
+
+    async def save(self, model):
+        """Delete and return "None".
+
+        "delete_action" may be a coroutine function.  Post-save
+        processors are not invoked for DELETE views.
+        """
+        model = await self.interleave('pre_save', model)
+        result = self.delete_action(model)
+        if inspect.isawaitable(result):
+            await result
@@ -0,0 +1,150 @@
+"""Cache module."""
+from abc import abstractmethod
+import collections
+import hashlib
+import threading
+import time
+import uuid
+
+
+class CacheBackend:
+    """Cache storage abstraction layer.
+
+    "get" returns a stored value or None when the key is missing or
+    expired.  "set" stores a value for at most "ttl" seconds; a "ttl"
+    of None stores the value until it is evicted.  Keys are strings so
+    backends can be shared between processes (e.g. Redis, Memcached).
+    """
+
+    @abstractmethod
+    def get(self, key: str):
+        """Return a stored value or None."""
+        return
+
+    @abstractmethod
+    def set(self, key: str, value, ttl: float=None):
+        """Store a value."""
+        return
+
+    @abstractmethod
+    def delete(self, key: str):
+        """Remove a value."""
+        return
+
+
+class LRUCache(CacheBackend):
+    """In-process, thread-safe LRU cache with per-key expiration.
+
+    Keyword arguments:
+        maxsize (int): Maximum number of stored keys.
+        ttl (float): Default number of seconds a key is stored for.
+    """
+
+    def __init__(self, maxsize: int=1024, ttl: float=None,
+                 clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._data = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        """Return a stored value or None."""
+        with self._lock:
+            try:
+                expires, value = self._data[key]
+            except KeyError:
+                return None
+            if expires is not None and expires <= self.clock():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Store a value."""
+        ttl = self.ttl if ttl is None else ttl
+        expires = None if ttl is None else self.clock() + ttl
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        """Remove a value."""
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class NamespacedCache:
+    """Cache with namespace-wide invalidation.
+
+    Entries are keyed by namespace and by a generation token stored in
+    the backend.  Invalidating a namespace replaces its token which
+    orphans every entry of the previous generation without having to
+    enumerate them.
+
+    Keyword arguments:
+        backend (CacheBackend): Storage backend.  Defaults to an
+            in-process "LRUCache".
+        ttl (float): Number of seconds an entry is stored for.
+    """
+
+    prefix = 'entry'
+
+    def __init__(self, backend: CacheBackend=None, ttl: float=None):
+        self.backend = LRUCache() if backend is None else backend
+        self.ttl = ttl
+
+    def generation(self, namespace: str) -> str:
+        """Return the current generation token of a namespace."""
+        key = 'generation:{}'.format(namespace)
+        token = self.backend.get(key)
+        if token is None:
+            token = uuid.uuid4().hex
+            self.backend.set(key, token)
+        return token
+
+    def invalidate(self, namespace: str):
+        """Discard every entry stored in a namespace."""
+        key = 'generation:{}'.format(namespace)
+        self.backend.set(key, uuid.uuid4().hex)
+
+    def key(self, namespace: str, *parts: str) -> str:
+        """Return a cache key for the current namespace generation."""
+        return '{}:{}:{}:{}'.format(
+            self.prefix, namespace, self.generation(namespace),
+            '\x1f'.join(parts))
+
+    def get(self, key: str):
+        """Return a stored value or None."""
+        return self.backend.get(key)
+
+    def set(self, key: str, value):
+        """Store a value."""
+        self.backend.set(key, value, self.ttl)
+
+
+class ResponseCache(NamespacedCache):
+    """Namespaced cache of encoded responses."""
+
+    prefix = 'response'
+
+    def get(self, key: str):
+        """Return a stored (etag, body) pair or None."""
+        return self.backend.get(key)
+
+    def set(self, key: str, body: bytes) -> str:
+        """Store an encoded response and return its ETag."""
+        etag = make_etag(body)
+        self.backend.set(key, (etag, body), self.ttl)
+        return etag
+
+
+def make_etag(body: bytes) -> str:
+    """Return a strong entity tag for an encoded response body."""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
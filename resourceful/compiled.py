@@ -0,0 +1,189 @@
+"""Compiled deserializer module."""
+from resourceful.errors import ValidationError
+from resourceful.serializer import Serializer
+
+
+MISSING = type('Missing', (), {'__repr__': lambda self: '<MISSING>'})()
+
+TYPE_CHECKS = {
+    str: ('type(value) is str', 'Not a valid string.'),
+    int: ('type(value) is int', 'Not a valid integer.'),
+    float: ('type(value) is float or type(value) is int',
+            'Not a valid number.'),
+    bool: ('type(value) is bool', 'Not a valid boolean.'),
+    dict: ('type(value) is dict', 'Not a valid object.'),
+    list: ('type(value) is list', 'Not a valid list.'),
+}
+
+
+class Field:
+    """Declared attribute of a compiled serializer.
+
+    Built-in JSON types ("str", "int", "float", "bool", "dict" and
+    "list") are type checked in line.  Any other callable is used as a
+    converter which raises "ValueError" or "TypeError" for invalid
+    values.  "validate" is called with the converted value and fails
+    the field when it returns False or raises "ValueError".
+
+    Keyword arguments:
+        type (callable): JSON type or converter.
+        required (bool): Report missing values.
+        allow_none (bool): Accept null values.
+        default: Value used when the key is missing.
+        validate (callable): Additional value check.
+        attribute (str): Output key.  Defaults to the field name with
+            dashes replaced by underscores.
+    """
+
+    def __init__(self, type=str, required: bool=False,
+                 allow_none: bool=False, default=MISSING, validate=None,
+                 attribute: str=None):
+        self.type = type
+        self.required = required
+        self.allow_none = allow_none
+        self.default = default
+        self.validate = validate
+        self.attribute = attribute
+
+
+def compile_validator(fields, partial=False):
+    """Return a function which validates and converts a dictionary.
+
+    The generated function accepts the input dictionary, a list
+    errors are appended to and the JSON pointer of the dictionary.  It
+    reads the declared keys only, so unknown keys cost nothing.
+
+    Keyword arguments:
+        fields (dict): Mapping of input key to "Field".
+        partial (bool): Ignore missing required fields and skip
+            defaults, so only the submitted keys are returned.
+    """
+    namespace = {'MISSING': MISSING, 'make_error': make_error}
+    lines = ['def validate(data, errors, pointer):', '    result = {}']
+    for index, (name, field) in enumerate(fields.items()):
+        target = 'result[{!r}]'.format(
+            field.attribute or name.replace('-', '_'))
+        fail = 'errors.append(make_error(pointer + {!r}, {{}}))'.format(
+            '/' + name)
+
+        def add(indent, *block):
+            lines.extend(' ' * indent + line for line in block)
+
+        add(4, 'value = data.get({!r}, MISSING)'.format(name),
+            'if value is MISSING:')
+        if field.required and not partial:
+            add(8, fail.format(repr('Missing data for required field.')))
+        elif field.default is not MISSING and not partial:
+            namespace['_d{}'.format(index)] = field.default
+            add(8, '{} = _d{}'.format(target, index))
+        else:
+            add(8, 'pass')
+
+        add(4, 'elif value is None:')
+        if field.allow_none:
+            add(8, '{} = None'.format(target))
+        else:
+            add(8, fail.format(repr('Field may not be null.')))
+
+        if field.type in TYPE_CHECKS:
+            check, message = TYPE_CHECKS[field.type]
+            add(4, 'elif not ({}):'.format(check), '    ' + fail.format(
+                repr(message)), 'else:')
+            if field.type is float:
+                add(8, 'value = float(value)')
+            indent = 8
+        else:
+            namespace['_c{}'.format(index)] = field.type
+            add(4, 'else:', '    try:',
+                '        value = _c{}(value)'.format(index),
+                '    except (TypeError, ValueError) as exc:',
+                '        ' + fail.format("str(exc) or 'Invalid value.'"),
+                '    else:')
+            indent = 12
+
+        if field.validate is None:
+            add(indent, '{} = value'.format(target))
+        else:
+            namespace['_v{}'.format(index)] = field.validate
+            add(indent, 'try:',
+                '    valid = _v{}(value) is not False'.format(index),
+                'except ValueError as exc:',
+                '    ' + fail.format("str(exc) or 'Invalid value.'"),
+                'else:',
+                '    if valid:',
+                '        {} = value'.format(target),
+                '    else:',
+                '        ' + fail.format(repr('Invalid value.')))
+    lines.append('    return result')
+
+    exec(compile('\n'.join(lines), '<compiled validator>', 'exec'),
+         namespace)
+    return namespace['validate']
+
+
+class CompiledSerializer(Serializer):
+    """Serializer with a precompiled deserializer.
+
+    "fields" maps input keys to "Field" declarations.  Every subclass
+    compiles a full and a partial validator when it is created, so
+    deserializing a form or a list of forms only calls plain
+    functions.  Forms are unwrapped along "envelope" (the JSONAPI
+    "data.attributes" path by default; None reads flat dictionaries).
+    Errors of every form and field are collected in one pass and
+    raised together as a "ValidationError" with JSON pointers.  Passing
+    "partial=True" skips required field checks and defaults (e.g. for
+    PATCH).
+
+    Attributes:
+        envelope (tuple): Keys leading to the attributes of a form.
+    """
+
+    envelope = ('data', 'attributes')
+    fields = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.validator = staticmethod(compile_validator(cls.fields))
+        cls.partial_validator = staticmethod(
+            compile_validator(cls.fields, partial=True))
+        cls.envelope_pointer = ''.join(
+            '/{}'.format(key) for key in cls.envelope or ())
+
+    def deserialize(self, form, many=False, partial=False, **schema_args):
+        """Return a deserialized dictionary or list of dictionaries."""
+        validate = self.partial_validator if partial else self.validator
+        errors = []
+        if many:
+            if type(form) is not list:
+                raise ValidationError([make_error('', 'Not a valid list.')])
+            result = []
+            for index, item in enumerate(form):
+                pointer = '/{}'.format(index)
+                attributes = self.unwrap(item, errors, pointer)
+                if attributes is not None:
+                    result.append(validate(
+                        attributes, errors, pointer + self.envelope_pointer))
+        else:
+            attributes = self.unwrap(form, errors, '')
+            if attributes is not None:
+                result = validate(attributes, errors, self.envelope_pointer)
+        if errors:
+            raise ValidationError(errors)
+        return result
+
+    def unwrap(self, form, errors, pointer):
+        """Return the attributes of a form or None."""
+        for key in self.envelope or ():
+            if type(form) is not dict:
+                break
+            pointer += '/' + key
+            form = form.get(key)
+        if type(form) is not dict:
+            errors.append(make_error(pointer, 'Not a valid object.'))
+            return None
+        return form
+
+
+def make_error(pointer, detail):
+    """Return a JSONAPI error object."""
+    return {'detail': detail, 'source': {'pointer': pointer}}
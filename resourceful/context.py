@@ -0,0 +1,112 @@
+"""Request context module."""
+
+
+class _ContextMeta(type):
+    """Resolve a context's annotated keys to slots at class creation."""
+
+    def __new__(mcs, name, bases, attrs):
+        defaults = {}
+        if '__slots__' not in attrs:
+            annotations = attrs.get('__annotations__', {})
+            for key in annotations:
+                if key in attrs:
+                    defaults[key] = attrs.pop(key)
+            attrs['__slots__'] = tuple(annotations)
+
+        cls = super().__new__(mcs, name, bases, attrs)
+        cls.__keys__ = frozenset(
+            key for klass in cls.__mro__
+            for key in getattr(klass, '__slots__', ()) if key != '_extra')
+        cls.__key_defaults__ = dict(
+            getattr(cls, '__key_defaults__', {}), **defaults)
+        return cls
+
+
+class RequestContext(metaclass=_ContextMeta):
+    """Per-request key-value store.
+
+    Keys declared as class annotations are stored in slots; any other
+    key falls back to a dictionary.  Declared keys without a default
+    are missing until they are assigned.  Defaults are shared between
+    instances and should be immutable.
+
+    Example:
+
+        class UsersContext(RequestContext):
+            run_task: bool = False
+            account_id: int
+    """
+
+    __slots__ = ('_extra', )
+
+    def __init__(self, **values):
+        self._extra = {}
+        for key, value in self.__key_defaults__.items():
+            setattr(self, key, value)
+        for key, value in values.items():
+            self[key] = value
+
+    def __getitem__(self, key):
+        """Return a key's value."""
+        if key in self.__keys__:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        """Set a key's value."""
+        if key in self.__keys__:
+            setattr(self, key, value)
+        else:
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        """Remove a key."""
+        if key in self.__keys__:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        else:
+            del self._extra[key]
+
+    def __contains__(self, key):
+        """Return True if the key is set."""
+        if key in self.__keys__:
+            return hasattr(self, key)
+        return key in self._extra
+
+    def __iter__(self):
+        """Iterate over the set keys."""
+        for key in sorted(self.__keys__):
+            if hasattr(self, key):
+                yield key
+        yield from self._extra
+
+    def __len__(self):
+        """Return the number of set keys."""
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return '<{} {!r}>'.format(type(self).__name__, self.as_dict())
+
+    def get(self, key, default=None):
+        """Return a key's value or a default."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key, default=None):
+        """Return a key's value, setting it to a default if missing."""
+        try:
+            return self[key]
+        except KeyError:
+            self[key] = default
+            return default
+
+    def as_dict(self) -> dict:
+        """Return the set keys and values as a dictionary."""
+        return {key: self[key] for key in self}
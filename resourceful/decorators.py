@@ -30,6 +30,31 @@ def post_save(fn):
     return tag_processor(fn, 'post_save')
 
 
+def after_response(fn):
+    """Method register that runs tasks after the response is sent."""
+    return tag_processor(fn, 'after_response')
+
+
+def pre_save_all(fn):
+    """Method register that runs tasks prior to a bulk database commit."""
+    return tag_processor(fn, 'pre_save_all')
+
+
+def post_save_all(fn):
+    """Method register that runs tasks after a bulk database commit."""
+    return tag_processor(fn, 'post_save_all')
+
+
+def pre_archive_all(fn):
+    """Method register that runs tasks prior to a set-based archive."""
+    return tag_processor(fn, 'pre_archive_all')
+
+
+def post_archive_all(fn):
+    """Method register that runs tasks after a set-based archive."""
+    return tag_processor(fn, 'post_archive_all')
+
+
 def pre_dump(fn):
     """Method register that runs tasks prior to response serialization."""
     return tag_processor(fn, 'pre_dump')
@@ -40,6 +65,22 @@ def post_dump(fn):
     return tag_processor(fn, 'post_dump')
 
 
+def post_dump_chunk(fn):
+    """Method register that runs tasks after each streamed chunk."""
+    return tag_processor(fn, 'post_dump_chunk')
+
+
+def independent(fn):
+    """Mark a processor as independent of its neighbours.
+
+    Asynchronous views run consecutive independent processors of a
+    stage concurrently.  Independent processors receive the same
+    argument and their return values are discarded.
+    """
+    fn.__invokation_independent__ = True
+    return fn
+
+
 def tag_processor(fn, name):
     """Return a function tagged with its invokation type and priority."""
     if hasattr(fn, '__call__'):
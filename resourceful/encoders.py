@@ -0,0 +1,125 @@
+"""JSON encoder module."""
+from abc import abstractmethod
+import datetime
+import decimal
+import json
+import uuid
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+def encode_default(obj):
+    """Return a JSON representation of a value the encoders can not handle.
+
+    Dates and times are encoded in ISO 8601 format, decimals and UUIDs
+    as strings.  Raises "TypeError" for any other type.
+    """
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    raise TypeError('Object of type {} is not JSON serializable.'.format(
+        type(obj).__name__))
+
+
+class Encoder:
+    """JSON encoding abstraction layer.
+
+    "dumps" accepts a JSON serializable object and returns compact,
+    UTF-8 encoded bytes.
+
+    Attributes:
+        name (str): Registry name of the encoder.
+    """
+
+    name = None
+
+    @abstractmethod
+    def dumps(self, obj) -> bytes:
+        """Return the encoded object."""
+        return
+
+
+class JSONEncoder(Encoder):
+    """Standard library encoder."""
+
+    name = 'json'
+
+    def __init__(self, default=encode_default):
+        self._encode = json.JSONEncoder(
+            ensure_ascii=False, separators=(',', ':'), default=default).encode
+
+    def dumps(self, obj) -> bytes:
+        """Return the encoded object."""
+        return self._encode(obj).encode('utf-8')
+
+
+class OrjsonEncoder(Encoder):
+    """"orjson" encoder.
+
+    Non-string dictionary keys are converted to strings.  Documents
+    orjson rejects (e.g. integers wider than 64 bits) are encoded by
+    the standard library encoder.
+    """
+
+    name = 'orjson'
+
+    def __init__(self, default=encode_default):
+        if orjson is None:
+            raise ImportError('The "orjson" package is not installed.')
+        self.default = default
+        self.fallback = JSONEncoder(default)
+
+    def dumps(self, obj) -> bytes:
+        """Return the encoded object."""
+        try:
+            return orjson.dumps(
+                obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return self.fallback.dumps(obj)
+
+
+class UjsonEncoder(Encoder):
+    """"ujson" encoder."""
+
+    name = 'ujson'
+
+    def __init__(self, default=encode_default):
+        if ujson is None:
+            raise ImportError('The "ujson" package is not installed.')
+        self.default = default
+
+    def dumps(self, obj) -> bytes:
+        """Return the encoded object."""
+        return ujson.dumps(
+            obj, ensure_ascii=False, default=self.default).encode('utf-8')
+
+
+ENCODERS = {
+    encoder.name: encoder
+    for encoder in (OrjsonEncoder, UjsonEncoder, JSONEncoder)}
+
+
+def get_encoder(name: str=None) -> Encoder:
+    """Return an encoder instance.
+
+    The fastest installed encoder is returned when no name is given.
+
+    Keyword arguments:
+        name (str): Encoder name.  One of "orjson", "ujson" or "json".
+    """
+    if name is not None:
+        return ENCODERS[name]()
+    for encoder in ENCODERS.values():
+        try:
+            return encoder()
+        except ImportError:
+            continue
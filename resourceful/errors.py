@@ -1,4 +1,14 @@
-
-
 class ResourceError(Exception):
     pass
+
+
+class ValidationError(ResourceError):
+    """Invalid request payload.
+
+    Attributes:
+        errors (list): JSONAPI error objects.
+    """
+
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
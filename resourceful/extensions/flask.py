@@ -1,21 +1,105 @@
 """Flask extension module."""
-from flask import jsonify, make_response, request, views
+from flask import (
+    Response, abort, current_app, g, request, stream_with_context, views)
+from resourceful.context import RequestContext
+from resourceful.encoders import Encoder, get_encoder
+from resourceful.loader import Loader
+from resourceful.tasks import TaskRunner
+from urllib.parse import urlencode
 
+import hashlib
+import itertools
 import resourceful
 
 
+ROUTE_METHODS = ('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS')
+
+
 class FlaskResourceful(object):
-    """REST API framework."""
+    """REST API framework.
+
+    By default every view is registered as its own URL rule.  With
+    "merge_routes" a route's views share a single rule whose view
+    function dispatches on the request method through a table built
+    at registration, so the URL map matches against fewer rules.
+    Merged rules accept every method in "ROUTE_METHODS" and answer
+    methods without a view with "405 Method Not Allowed", so later
+    registrations for a route only extend its table.  Merged routes
+    are kept in "routes" by their rule.
+
+    Keyword arguments:
+        encoder (str|Encoder): Encoder instance or name used to build
+            JSON responses.  Defaults to the fastest installed encoder.
+        merge_routes (bool): Register one URL rule per route.
+    """
+
+    def __init__(self, encoder=None, merge_routes: bool=False):
+        if not isinstance(encoder, Encoder):
+            encoder = get_encoder(encoder)
+        self.encoder = encoder
+        self.merge_routes = merge_routes
+        self.routes = {}
 
     def init_app(self, app):
         """Initialize the flask application instance."""
         self.app = app
+        app.extensions['resourceful'] = self
+        app.teardown_request(clear_loaders)
+
+    def add_routes(self, routes):
+        """Register the views of several routes.
+
+        Keyword arguments:
+            routes (dict|iterable): Mapping or (route, views) pairs.
+        """
+        if isinstance(routes, dict):
+            routes = routes.items()
+        for route, views in routes:
+            self.add_views(route, views)
 
     def add_views(self, route, views):
         """Register a set of views to a given route."""
+        if self.merge_routes:
+            return self.add_route(route, views)
         for view in views:
             self.add_view(route, view, [view._method])
 
+    def add_route(self, route, views):
+        """Register a set of views to a single, method dispatched rule.
+
+        Repeated calls for a route add their methods to its table.
+        Raises "ValueError" when two views handle the same method.
+        """
+        table = self.routes.get(route)
+        methods = [view._method for view in views]
+        for method in methods:
+            if method in (table or ()) or methods.count(method) > 1:
+                raise ValueError('Route "{}" already handles {}.'.format(
+                    route, method))
+
+        if table is None:
+            table = self.routes[route] = {}
+
+            def view_func(**uri_args):
+                view = table.get(request.method)
+                if view is not None:
+                    return view(**uri_args)
+                allowed = sorted(set(table) | {'OPTIONS'})
+                if request.method == 'OPTIONS':
+                    return Response(headers={'Allow': ', '.join(allowed)})
+                abort(405, valid_methods=allowed)
+            view_func.__name__ = route
+            view_func.dispatch_table = table
+            view_func.provide_automatic_options = False
+            self.app.add_url_rule(
+                route, view_func=view_func, methods=ROUTE_METHODS)
+
+        for view in views:
+            table[view._method] = view.as_view(
+                '{}{}'.format(route, [view._method]))
+        if 'GET' in table:
+            table.setdefault('HEAD', table['GET'])
+
     def add_view(self, route, view, methods):
         """Register a view to a route."""
         view_func = view.as_view('{}{}'.format(route, methods))
@@ -23,41 +107,320 @@ class FlaskResourceful(object):
 
 
 class FlaskResourcefulView(resourceful.View, views.View):
-    """Flask integrated resourceful view."""
+    """Flask integrated resourceful view.
+
+    Flask creates a view instance per request.  Each instance binds a
+    new "context_class" instance when it is created and item access on
+    the view reads and writes that context directly.  Views must not
+    set "init_every_request" to False.
+
+    "loader" is a request-scoped identity map stored in the context.
+    It is built by "make_loader" from the view's "fetch_many" and
+    "identity" methods (provided by e.g. the jsonapi extension) and is
+    cleared when the request is torn down.
+
+    Attributes:
+        context_class (RequestContext): Request-local context type.
+        stream_chunk_size (int): Number of models serialized at a time
+            by "send_stream".
+        stream_envelope (str): Top-level key wrapping a streamed
+            collection.  Streams a bare array when None.
+    """
+
+    context_class = RequestContext
+    default_encoder = get_encoder()
+    stream_chunk_size = 500
+    stream_envelope = 'data'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.context = self.context_class()
+
+    @property
+    def encoder(self):
+        """Return the application's JSON encoder."""
+        extension = current_app.extensions.get('resourceful')
+        if extension is None:
+            return self.default_encoder
+        return extension.encoder
 
     @property
-    def context(self):
-        """Return a request-local context object."""
-        if not hasattr(request, 'resourceful_context'):
-            request.resourceful_context = {}
-        return request.resourceful_context
+    def loader(self):
+        """Return the request's loader, creating it on first use."""
+        loader = self.context.get('loader')
+        if loader is None:
+            loader = self.context['loader'] = self.make_loader()
+            g.setdefault('resourceful_loaders', []).append(loader)
+        return loader
+
+    def make_loader(self):
+        """Return a new request loader.
+
+        Requested keys are normalized by the view's "normalize_key"
+        method when it defines one.
+        """
+        return Loader(
+            self.fetch_many, self.identity,
+            getattr(self, 'normalize_key', None))
+
+    def record_timing(self, timing):
+        """Append a timing to the request's processor breakdown."""
+        self.context.setdefault('resourceful_timings', []).append(timing)
 
     def send_response(self, response, code):
         """Return a HTTP response."""
-        return make_response(jsonify(response), code)
+        return Response(
+            self.encoder.dumps(response), status=code,
+            mimetype='application/json')
+
+    def send_stream(self, models, code):
+        """Return a HTTP response streaming a serialized collection.
+
+        Models are pulled lazily from "models", a query or any other
+        iterable, and serialized in chunks through the serializer's
+        "serialize_all" method.  Post-dump processors can not see the
+        whole document, so each chunk's list of serialized items is
+        passed through the "post_dump_chunk" processors instead.
+        """
+        return Response(
+            stream_with_context(self.iter_stream(models)), status=code,
+            mimetype='application/json')
+
+    def iter_stream(self, models):
+        """Yield a serialized collection as encoded JSON fragments."""
+        dumps = self.encoder.dumps
+        envelope = self.stream_envelope
+        if envelope is None:
+            yield b'['
+        else:
+            yield b'{' + dumps(envelope) + b':['
+
+        schema_args = self.schema_args
+        separator = b''
+        for chunk in self.iter_chunks(models):
+            items = self.serializer.serialize_all(chunk, **schema_args)
+            if isinstance(items, dict):
+                items = items[envelope or 'data']
+            items = self.interleave('post_dump_chunk', items)
+            if items:
+                yield separator + b','.join(dumps(item) for item in items)
+                separator = b','
+
+        yield b']' if envelope is None else b']}'
+
+    def iter_chunks(self, models):
+        """Yield lists of at most "stream_chunk_size" models."""
+        size = self.stream_chunk_size
+        if hasattr(models, 'yield_per'):
+            models = models.yield_per(size)
+        models = iter(models)
+        chunk = list(itertools.islice(models, size))
+        while chunk:
+            yield chunk
+            chunk = list(itertools.islice(models, size))
 
     @property
     def __dict__(self):
-        """Return a dictionary of the thread-local context."""
+        """Return the request-local context."""
         return self.context
 
     def __getitem__(self, key):
-        """Return a thread-local-key's value."""
+        """Return a request-local-key's value."""
         return self.context[key]
 
     def __setitem__(self, key, value):
-        """Set a thread-local-key's value."""
+        """Set a request-local-key's value."""
         self.context[key] = value
 
     def __contains__(self, key):
-        """Return True if the thread-local-key exists."""
+        """Return True if the request-local-key exists."""
         return key in self.context
 
     def __len__(self):
-        """Return the number of keys in the thread-local context."""
+        """Return the number of keys in the request-local context."""
         return len(self.context)
 
-    @classmethod
-    def as_view(cls, name, *class_args, **class_kwargs):
-        cls.processors = resourceful.resolve_processors(cls)
-        return super().as_view(name, *class_args, **class_kwargs)
+
+class ResponseCacheMixin(object):
+    """Read view response caching.
+
+    Cached responses are served from a "pre_fetch" processor, before
+    the model is fetched or serialized, and are stored by a "post_dump"
+    processor.  Requests with a matching "If-None-Match" header are
+    answered with "304 Not Modified" (weak "ETag" comparison).  Keys
+    are built from the cache namespace, the request path (route and
+    URI arguments), the query string and "cache_vary".
+
+    A cache hit aborts at "pre_fetch(1000)", so lower priority
+    "pre_fetch" processors and every "post_fetch" processor (e.g.
+    permission checks) are skipped.  Responses which depend on the
+    requesting user must be told apart by "cache_vary", which defaults
+    to a digest of the "Authorization" header.  Views authenticating
+    by other means (e.g. session cookies) must override it, for example
+    to return the user's id.
+
+    Attributes:
+        response_cache (ResponseCache): Caching is disabled when None.
+        cache_namespace (str): Name shared by the views of a resource.
+            Defaults to the table name of the view's model.
+    """
+
+    response_cache = None
+    cache_namespace = None
+
+    @property
+    def cache_key(self):
+        """Return the response cache key of the current request."""
+        namespace = resource_namespace(self)
+        query = urlencode(sorted(request.args.items(multi=True)))
+        return self.response_cache.key(
+            namespace, request.path, query, self.cache_vary)
+
+    @property
+    def cache_vary(self):
+        """Return the part of the cache key identifying the requester."""
+        authorization = request.headers.get('Authorization')
+        if authorization is None:
+            return ''
+        return hashlib.sha256(authorization.encode('utf-8')).hexdigest()
+
+    @resourceful.pre_fetch(1000)
+    def serve_cached_response(self, query, **uri_args):
+        """Abort with the cached response if one exists."""
+        if self.response_cache is None:
+            return query
+
+        key = self['resourceful_cache_key'] = self.cache_key
+        entry = self.response_cache.get(key)
+        if entry is not None:
+            etag, body = entry
+            abort(self.make_cached_response(body, etag, self._code))
+        return query
+
+    @resourceful.post_dump(-1000)
+    def cache_response(self, response):
+        """Store the encoded response."""
+        if self.response_cache is None:
+            return response
+
+        body = self.encoder.dumps(response)
+        etag = self.response_cache.set(self['resourceful_cache_key'], body)
+        self['resourceful_cache_entry'] = (etag, body)
+        return response
+
+    def send_response(self, response, code):
+        """Return a HTTP response reusing the cached body."""
+        if 'resourceful_cache_entry' not in self:
+            return super().send_response(response, code)
+        etag, body = self['resourceful_cache_entry']
+        return self.make_cached_response(body, etag, code)
+
+    def make_cached_response(self, body, etag, code):
+        """Return a HTTP response or "304 Not Modified"."""
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = Response(
+                body, status=code, mimetype='application/json')
+        response.set_etag(etag)
+        return response
+
+
+class CacheInvalidationMixin(object):
+    """Write view response cache invalidation.
+
+    Successful responses invalidate the view's cache namespace.  The
+    response is sent after the transaction is committed so readers can
+    not re-cache stale data.
+
+    Attributes:
+        response_cache (ResponseCache): Invalidation is disabled when
+            None.
+        cache_namespace (str): Name shared by the views of a resource.
+            Defaults to the table name of the view's model.
+    """
+
+    response_cache = None
+    cache_namespace = None
+
+    def send_response(self, response, code):
+        """Invalidate the cache namespace and return a HTTP response."""
+        if self.response_cache is not None and code < 400:
+            self.response_cache.invalidate(resource_namespace(self))
+        return super().send_response(response, code)
+
+
+class DeferredProcessorMixin(object):
+    """After-response processor mixin.
+
+    Models passed through "post_save" are kept for the view's
+    "after_response" processors, which run once the response has been
+    sent and closed (Werkzeug's "call_on_close") on "task_runner".
+    Processors run outside of the request context and must only rely
+    on the view's context and their arguments.  Unlike other stages,
+    every processor receives the saved model; return values are
+    discarded and exceptions are logged per processor.
+
+    Attributes:
+        task_runner (TaskRunner): Runs the deferred processors.
+            Defaults to running them in the request's thread after the
+            response is closed.
+    """
+
+    task_runner = TaskRunner(synchronous=True)
+
+    @resourceful.post_save(-1000)
+    def defer_after_response(self, model, **kwargs):
+        """Keep a saved model for the after-response processors."""
+        if self.processors['after_response']:
+            self.context.setdefault('resourceful_deferred', []).append(
+                (model, kwargs))
+        return model
+
+    def send_response(self, response, code):
+        """Return a HTTP response running deferred processors on close."""
+        response = super().send_response(response, code)
+        if self.context.get('resourceful_deferred'):
+            response.call_on_close(self.schedule_deferred)
+        return response
+
+    def schedule_deferred(self):
+        """Submit the deferred processors to the task runner."""
+        deferred = self.context.get('resourceful_deferred', ())
+        self.context['resourceful_deferred'] = []
+        if deferred:
+            self.task_runner.submit(self.run_deferred, deferred)
+
+    def run_deferred(self, deferred):
+        """Run the after-response processors of each saved model.
+
+        Every processor receives the saved model.  A failing processor
+        is reported by the task runner and does not stop the others.
+        """
+        processors = self.processors['after_response']
+        for model, kwargs in deferred:
+            for processor in processors:
+                self.task_runner.run(processor, (self, model), kwargs)
+
+
+def resource_namespace(view):
+    """Return the response cache namespace of a view.
+
+    Views of a resource are mounted on several routes (e.g. "/users"
+    and "/users/<id>"), so the namespace is derived from the model
+    rather than the URL rule.
+    """
+    if view.cache_namespace is not None:
+        return view.cache_namespace
+    model = getattr(view, 'model', None)
+    if model is None:
+        raise ValueError(
+            '{} requires a "cache_namespace" or a "model".'.format(
+                type(view).__name__))
+    return getattr(model, '__tablename__', model.__name__)
+
+
+def clear_loaders(exc=None):
+    """Clear the loaders created during the request."""
+    for loader in g.pop('resourceful_loaders', ()):
+        loader.clear()
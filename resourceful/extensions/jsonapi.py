@@ -1,7 +1,13 @@
 """jsonapiquery extension module."""
 from abc import abstractmethod, abstractproperty
-from jsonapiquery.database.sqlalchemy import include
+from resourceful.cache import LRUCache, NamespacedCache
+from urllib.parse import urlencode
 
+import base64
+import binascii
+import datetime
+import hashlib
+import json
 import resourceful
 
 
@@ -13,8 +19,36 @@ class CompoundDocumentMixin(object):
     used to be JSONAPI compliant. It is recommended that your
     serializer implements "marshmallow-jsonapi" or another JSONAPI
     compliant serialization library.
+
+    Included resources are loaded with bounded "IN" batches of at most
+    "include_batch_size" identifiers and are de-duplicated across
+    relationships.  Parsed include plans are cached per view class and
+    "include_parameter" value.  When every included relationship was
+    already loaded by the primary fetch (e.g. eagerly) no include
+    query is issued.
+
+    Sparse fieldsets ("fields[type]=a,b") are pushed down into the
+    primary query with "load_only"; primary and foreign key columns are
+    always loaded.  Setting the "eager_includes" query option loads
+    the included relationships with "selectinload", restricted to the
+    requested fields of each included type, so the primary fetch
+    provides the included resources.  The primary type's fields are
+    passed to the serializer as the "fields" schema argument.
+
+    "fetch_many", "identity" and "normalize_key" back a view's request
+    loader (see "FlaskResourcefulView.loader").  Requested keys (e.g.
+    string URI arguments) are converted to the primary key's type.
+    Fetched models are added to the loader when the view has one, so
+    processors resolving them by primary key do not query again.
+
+    Attributes:
+        include_batch_size (int): Maximum number of identifiers per
+            include query.
+        include_plans (LRUCache): Parsed include plan cache.
     """
 
+    include_batch_size = 500
+    include_plans = LRUCache(maxsize=256)
     query_options = {}
 
     @abstractproperty
@@ -32,6 +66,165 @@ class CompoundDocumentMixin(object):
         """Raise JSONAPI related errors."""
         return None
 
+    @property
+    def query_parameters(self):
+        """Return the raw query string parameters of the request.
+
+        Flask views can return "request.args".  Returns None when the
+        parameters are not available, which disables query plan
+        caching.
+        """
+        return None
+
+    @property
+    def request_parameters(self):
+        """Return the request's query parameters or an empty mapping."""
+        return self.query_parameters or {}
+
+    @property
+    def include_parameter(self):
+        """Return the raw "include" parameter of the request.
+
+        Include plans are only cached, and loaded relationships only
+        reused, when this returns a string.
+        """
+        return self.request_parameters.get('include')
+
+    @property
+    def sparse_fields(self):
+        """Return the requested fieldsets as a {type: [field]} mapping."""
+        fields = {}
+        for key, value in self.request_parameters.items():
+            if key.startswith('fields[') and key.endswith(']'):
+                fields[key[7:-1]] = [name for name in value.split(',') if name]
+        return fields
+
+    @property
+    def resource_type(self):
+        """Return the JSONAPI type of the view's model."""
+        return self.model_type(self.model)
+
+    def model_type(self, model):
+        """Return the JSONAPI type of a model class."""
+        return model.__tablename__
+
+    @property
+    def schema_args(self):
+        """Return keyword arguments passed to the serializer."""
+        schema_args = dict(getattr(super(), 'schema_args', {}))
+        fields = self.sparse_fields.get(self.resource_type)
+        if fields is not None:
+            schema_args['fields'] = fields
+        return schema_args
+
+    def sparse_columns(self, model, fields):
+        """Return the column attributes of a model to load."""
+        from sqlalchemy import inspect
+
+        mapper = inspect(model)
+        keys = set()
+        for prop in mapper.column_attrs:
+            if any(column.primary_key or column.foreign_keys
+                   for column in prop.columns):
+                keys.add(prop.key)
+        for name in fields:
+            key = name.replace('-', '_')
+            if key in mapper.column_attrs:
+                keys.add(key)
+        return [getattr(model, key) for key in sorted(keys)]
+
+    @resourceful.pre_fetch(-2)
+    def apply_sparse_fieldsets(self, query, **kwargs):
+        """Return a query restricted to the requested columns."""
+        from sqlalchemy import inspect
+        from sqlalchemy.orm import load_only, selectinload
+
+        fields = self.sparse_fields
+        options = []
+        primary = fields.get(self.resource_type)
+        if primary is not None:
+            options.append(load_only(*self.sparse_columns(self.model, primary)))
+
+        eager = self.query_options.get('eager_includes', False)
+        may_include = self.query_options.get('may_include', True)
+        if eager and may_include and self.include_parameter:
+            for path in self.include_parameter.split(','):
+                loader, model = None, self.model
+                for name in path.split('.'):
+                    relationship = inspect(model).relationships.get(
+                        name.replace('-', '_'))
+                    if relationship is None:
+                        break
+                    attribute = getattr(model, relationship.key)
+                    if loader is None:
+                        loader = selectinload(attribute)
+                    else:
+                        loader = loader.selectinload(attribute)
+                    model = relationship.mapper.class_
+                    columns = fields.get(self.model_type(model))
+                    if columns is None:
+                        options.append(loader)
+                    else:
+                        options.append(loader.load_only(
+                            *self.sparse_columns(model, columns)))
+
+        if options:
+            query = query.options(*options)
+        return query
+
+    @resourceful.post_fetch(-1000)
+    def store_fetched_model(self, model):
+        """Keep a reference to the fetched model or models."""
+        self.fetched_model = model
+        loader = getattr(self, 'loader', None)
+        if loader is not None and model is not None:
+            models = model if isinstance(model, (list, tuple)) else [model]
+            for obj in models:
+                loader.prime(obj)
+        return model
+
+    def fetch_many(self, model, keys):
+        """Return the model instances matching a list of primary keys."""
+        from sqlalchemy import inspect
+
+        primary_key = inspect(model).primary_key
+        if len(primary_key) != 1:
+            return [
+                obj for obj in (self.session.get(model, key) for key in keys)
+                if obj is not None]
+        return self.session.query(model).filter(
+            primary_key[0].in_(keys)).all()
+
+    def normalize_key(self, model, key):
+        """Return a primary key as its columns' Python types.
+
+        Keys the columns can not represent are returned unchanged.
+        """
+        from sqlalchemy import inspect
+
+        columns = inspect(model).primary_key
+        try:
+            if len(columns) == 1:
+                return coerce_value(columns[0], key)
+            return tuple(
+                coerce_value(column, value)
+                for column, value in zip(columns, key))
+        except (TypeError, ValueError):
+            return key
+
+    def identity(self, obj):
+        """Return the primary key of a model instance or None."""
+        from sqlalchemy import inspect
+        from sqlalchemy.exc import NoInspectionAvailable
+
+        try:
+            identity = inspect(obj).identity
+        except NoInspectionAvailable:
+            return None
+        if identity is None:
+            return None
+        return identity[0] if len(identity) == 1 else identity
+
     @resourceful.post_dump
     def compound_response(self, response):
         """Return a compound document."""
@@ -50,24 +243,163 @@ class CompoundDocumentMixin(object):
         else:
             return response
 
-        fields, errors = self.jsonapi.make_include_fields()
+        plan, errors = self.make_include_plan()
         if errors:
             return self.raise_jsonapi_errors(errors)
 
-        mappers, selects, schemas = self.jsonapi.make_query_includes(fields)
-        models = include(self.session, self.model, selects, mappers, model_ids)
-        models = self._remove_null_values(models)
+        mappers, selects, schemas = plan
+        models = self.include_loaded_models()
+        if models is None:
+            models = self.include_models(selects, mappers, model_ids)
         return self.jsonapi.make_included_response(response, models, schemas)
 
+    def make_include_plan(self):
+        """Return a cached "(mappers, selects, schemas)", errors pair."""
+        key = self.include_parameter
+        if key is not None:
+            plan = self.include_plans.get((type(self), key))
+            if plan is not None:
+                return plan
+
+        fields, errors = self.jsonapi.make_include_fields()
+        if errors:
+            plan = (None, errors)
+        else:
+            plan = (self.jsonapi.make_query_includes(fields), [])
+
+        if key is not None:
+            self.include_plans.set((type(self), key), plan)
+        return plan
+
+    def include_models(self, selects, mappers, model_ids):
+        """Return the models related to a set of primary identifiers."""
+        models = []
+        size = self.include_batch_size
+        for start in range(0, len(model_ids), size):
+            models.extend(self.query_includes(
+                selects, mappers, model_ids[start:start + size]))
+        return self._remove_null_values(models)
+
+    def query_includes(self, selects, mappers, model_ids):
+        """Return the models related to a batch of primary identifiers."""
+        from jsonapiquery.database.sqlalchemy import include
+        return include(self.session, self.model, selects, mappers, model_ids)
+
+    def include_loaded_models(self):
+        """Return the related models loaded by the primary fetch.
+
+        Returns None when the include parameter is unknown or when any
+        included relationship still has to be loaded.
+        """
+        parameter = self.include_parameter
+        models = getattr(self, 'fetched_model', None)
+        if not parameter or models is None:
+            return None
+        if not isinstance(models, (list, tuple)):
+            models = [models]
+
+        from sqlalchemy import inspect
+        from sqlalchemy.exc import NoInspectionAvailable
+
+        included = []
+        for path in parameter.split(','):
+            objects = models
+            for name in path.split('.'):
+                attribute = name.replace('-', '_')
+                related = []
+                for obj in objects:
+                    try:
+                        state = inspect(obj)
+                    except NoInspectionAvailable:
+                        return None
+                    relationship = state.mapper.relationships.get(attribute)
+                    if relationship is None or attribute in state.unloaded:
+                        return None
+                    value = getattr(obj, attribute)
+                    if relationship.uselist:
+                        related.extend(value)
+                    elif value is not None:
+                        related.append(value)
+                included.extend(related)
+                objects = related
+        return self._remove_null_values(included)
+
+    def _remove_null_values(self, models):
+        """Return the unique, non-null models in their original order."""
+        seen = set()
+        unique = []
+        for model in models:
+            if model is None or id(model) in seen:
+                continue
+            seen.add(id(model))
+            unique.append(model)
+        return unique
+
 
 class QueryMixin(CompoundDocumentMixin):
-    """JSONAPI collection handling mixin class."""
+    """JSONAPI collection handling mixin class.
+
+    Collections are paginated by "JSONAPIQuery" (offset and limit) by
+    default.  Setting the "pagination" query option to "keyset"
+    paginates with opaque "page[cursor]" values instead.  The cursor
+    holds the last row's values of the active sort columns followed by
+    the primary key, so every page costs the same as the first.  Sort
+    columns must not contain NULL values.
+
+    The "count" query option selects how the collection's total is
+    computed:
+
+        "exact": COUNT the filtered query on every request.
+        "cached": Cache exact counts per filter signature for
+            "count_cache.ttl" seconds.  Writes made by views using
+            "CountInvalidationMixin" invalidate the model's counts.
+        "estimate": Use the query planner's row estimate where the
+            database supports it (PostgreSQL) and fall back to "exact".
+        "has_more": Fetch one extra row instead of counting.
+
+    Keyset pagination defaults to "has_more" and offset pagination to
+    "exact".  Only "exact" offset pagination is delegated to
+    "JSONAPIQuery"; the other strategies read "page[offset]" and
+    "page[limit]" directly.  Totals are computed when the response is
+    built.
+
+    Setting "query_plans" caches the outcome of "filter_query" and
+    "sort_query" per view class and normalized "filter[...]" and
+    "sort" parameters.  A plan holds either the validation errors,
+    which are returned without parsing again, or the WHERE criteria
+    and ORDER BY clauses the parameters added to the query, which are
+    applied to later queries directly.  Plans reuse the same SQL
+    expression objects with their bound parameters, so SQLAlchemy's
+    compiled statement cache serves repeated shapes.  Filters adding
+    joins or otherwise changing the query state (e.g. DISTINCT, GROUP
+    BY or loader options) are not cached.  Caching is skipped when
+    "query_parameters" returns None.
+
+    Attributes:
+        count_cache (NamespacedCache): Cached count storage.
+        query_plans (LRUCache): Filter and sort plan cache.  Disabled
+            when None.
+    """
+
+    count_cache = NamespacedCache(ttl=60)
+    query_plans = None
 
     @abstractproperty
     def pagination_url(self):
         """Return a URL to paginate with."""
         return None
 
+    @property
+    def pagination_mode(self):
+        """Return "offset" or "keyset"."""
+        return self.query_options.get('pagination', 'offset')
+
+    @property
+    def count_strategy(self):
+        """Return the name of the total count strategy."""
+        default = 'has_more' if self.pagination_mode == 'keyset' else 'exact'
+        return self.query_options.get('count', default)
+
     def filter_query(self, query, errors):
         """Return a filtered query set."""
         may_filter = self.query_options.get('may_filter', True)
@@ -82,20 +414,261 @@ class QueryMixin(CompoundDocumentMixin):
             return self.jsonapi.sort(query, errors)
         return query, []
 
+    def filter_and_sort_query(self, query, errors):
+        """Return a filtered and sorted query set and its errors."""
+        if self.query_plans is None or self.query_parameters is None:
+            return self.run_filter_and_sort(query, errors)
+
+        key = self.query_plan_key()
+        plan = self.query_plans.get(key)
+        if plan is None:
+            result, plan = self.make_query_plan(query, errors)
+            self.query_plans.set(key, plan)
+            return result
+        if plan is UNCACHEABLE:
+            return self.make_query_plan(query, errors)[0]
+
+        criteria, order_by, errs = plan
+        if errs:
+            return query, list(errs)
+        if criteria:
+            query = query.filter(*criteria)
+        if order_by:
+            query = query.order_by(*order_by)
+        return query, []
+
+    def query_plan_key(self):
+        """Return the query plan cache key of the request."""
+        parameters = sorted(
+            (key, value) for key, value in self.query_parameters.items()
+            if key == 'sort' or key.startswith('filter'))
+        return (
+            type(self), self.query_options.get('may_filter', True),
+            self.query_options.get('may_sort', True), tuple(parameters))
+
+    def run_filter_and_sort(self, query, errors):
+        """Return a filtered and sorted query set and its new errors."""
+        errors = list(errors)
+        query, errs = self.filter_query(query, errors)
+        errors.extend(errs)
+        new_errors = list(errs)
+        query, errs = self.sort_query(query, errors)
+        new_errors.extend(errs)
+        return query, new_errors
+
+    def make_query_plan(self, query, errors):
+        """Return a "((query, errors), plan)" pair.
+
+        The plan holds the criteria and ORDER BY clauses filtering and
+        sorting added to the query, or UNCACHEABLE.
+        """
+        result, plan_errors = self.run_filter_and_sort(query, errors)
+        if plan_errors:
+            return (result, plan_errors), (None, None, tuple(plan_errors))
+
+        state = getattr(query, '__dict__', None)
+        result_state = getattr(result, '__dict__', None)
+        if state is None or result_state is None or any(state.get(key, UNCACHEABLE) is not
+               result_state.get(key, UNCACHEABLE)
+               for key in state.keys() | result_state.keys()
+               if key not in PLAN_ATTRIBUTES):
+            return (result, []), UNCACHEABLE
+
+        added = []
+        for attribute in PLAN_ATTRIBUTES:
+            before = getattr(query, attribute, None)
+            after = getattr(result, attribute, None)
+            if before is None or after is None or \
+                    not is_prefix(before, after):
+                return (result, []), UNCACHEABLE
+            added.append(tuple(after[len(before):]))
+        return (result, []), (added[0], added[1], ())
+
     def paginate_query(self, query, errors):
         """Return a paginated query set."""
         may_paginate = self.query_options.get('may_paginate', True)
-        if may_paginate:
-            return self.jsonapi.paginate(query, errors)
-        return query, []
+        if not may_paginate:
+            return query, None, []
+        if self.pagination_mode == 'keyset':
+            return self.paginate_keyset(query, errors)
+        if self.count_strategy != 'exact':
+            return self.paginate_offset(query, errors)
+        return self.jsonapi.paginate(query, errors)
+
+    def parse_page_parameter(self, parameter, default, minimum):
+        """Return an integer page parameter or raise "ValueError"."""
+        value = self.request_parameters.get(parameter, default)
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            value = None
+        if value is None or value < minimum:
+            raise ValueError(make_parameter_error(
+                parameter, 'Must be an integer greater than or equal to '
+                '{}.'.format(minimum)))
+        return value
+
+    def paginate_offset(self, query, errors):
+        """Return a query set limited to one page without counting."""
+        try:
+            offset = self.parse_page_parameter('page[offset]', 0, 0)
+            size = self.parse_page_parameter(
+                'page[limit]', self.query_options.get('page_size', 50), 1)
+        except ValueError as exc:
+            return query, None, [exc.args[0]]
+        size = min(size, self.query_options.get('max_page_size', size))
+
+        self.pagination_count_query = query.order_by(None)
+        self.pagination_page = {
+            'mode': 'offset', 'size': size, 'offset': offset}
+        return query.offset(offset).limit(size + 1), None, []
+
+    def paginate_keyset(self, query, errors):
+        """Return a query set limited to the page after the cursor."""
+        from sqlalchemy import and_, or_
+
+        try:
+            size = self.parse_page_parameter(
+                'page[size]', self.query_options.get('page_size', 50), 1)
+        except ValueError as exc:
+            return query, None, [exc.args[0]]
+        size = min(size, self.query_options.get('max_page_size', size))
+
+        columns = self.keyset_columns(query)
+        try:
+            keys = self.keyset_keys(columns)
+        except ValueError as exc:
+            return query, None, [exc.args[0]]
+        direction, values = 'next', None
+        cursor = self.request_parameters.get('page[cursor]')
+        if cursor:
+            try:
+                direction, values = decode_cursor(cursor)
+                values = [
+                    coerce_value(column, value)
+                    for (column, _), value in zip(columns, values)]
+                if direction not in ('next', 'prev') or \
+                        len(values) != len(columns):
+                    raise ValueError
+            except (TypeError, ValueError):
+                return query, None, [make_parameter_error(
+                    'page[cursor]', 'Invalid pagination cursor.')]
+
+        self.pagination_count_query = query.order_by(None)
+        self.pagination_page = {
+            'mode': 'keyset', 'keys': keys, 'size': size,
+            'direction': direction, 'cursor': cursor}
+
+        backwards = direction == 'prev'
+        query = query.order_by(None).order_by(*[
+            column.asc() if descending == backwards else column.desc()
+            for column, descending in columns])
+        if values is not None:
+            clauses = []
+            for index, (column, descending) in enumerate(columns):
+                if descending == backwards:
+                    comparison = column > values[index]
+                else:
+                    comparison = column < values[index]
+                clauses.append(and_(*[
+                    previous == value for (previous, _), value
+                    in zip(columns[:index], values)] + [comparison]))
+            query = query.filter(or_(*clauses))
+        return query.limit(size + 1), None, []
+
+    def keyset_columns(self, query):
+        """Return the (column, descending) pairs ordering a query.
+
+        The model's primary key columns are appended as a tie breaker.
+        """
+        from sqlalchemy import inspect
+        from sqlalchemy.sql import operators
+
+        clauses = getattr(query, '_order_by_clauses', None)
+        if clauses is None:
+            clauses = getattr(query, '_order_by', None) or ()
+
+        columns = []
+        for clause in clauses:
+            modifier = getattr(clause, 'modifier', None)
+            if modifier in (operators.asc_op, operators.desc_op):
+                clause, descending = clause.element, (
+                    modifier is operators.desc_op)
+            else:
+                descending = False
+            columns.append((clause, descending))
+
+        for key in inspect(self.model).primary_key:
+            if not any(key.compare(column) for column, _ in columns):
+                columns.append((key, False))
+        return columns
+
+    def keyset_keys(self, columns):
+        """Return the model attribute names of the keyset columns.
+
+        Raises "ValueError" for columns the model does not map (e.g. SQL
+        expressions or columns of other models).
+        """
+        from sqlalchemy import inspect
+        from sqlalchemy.orm.exc import UnmappedColumnError
+
+        mapper = inspect(self.model)
+        keys = []
+        for column, _ in columns:
+            try:
+                keys.append(mapper.get_property_by_column(column).key)
+            except UnmappedColumnError:
+                raise ValueError(make_parameter_error(
+                    'sort', 'Keyset pagination requires sorting by the '
+                    'resource\'s attributes.')) from None
+        return keys
+
+    def count_total(self, query):
+        """Return the total size of a query using the count strategy."""
+        strategy = self.count_strategy
+        if strategy == 'has_more':
+            return None
+        if strategy == 'exact':
+            return query.count()
+        if strategy == 'estimate':
+            return self.estimate_count(query)
+        if strategy == 'cached':
+            key = self.count_cache.key(
+                count_namespace(self.model), query_signature(query))
+            total = self.count_cache.get(key)
+            if total is None:
+                total = query.count()
+                self.count_cache.set(key, total)
+            return total
+        raise ValueError('Unknown count strategy "{}".'.format(strategy))
+
+    def estimate_count(self, query):
+        """Return the planner's row estimate of a query.
+
+        Filter values are passed as bound parameters.  Falls back to an
+        exact count when the plan can not be read.
+        """
+        session = query.session
+        dialect = session.get_bind().dialect
+        if dialect.name != 'postgresql':
+            return query.count()
+        try:
+            compiled = query.statement.compile(dialect=dialect)
+            params = compiled.params
+            if compiled.positional:
+                params = tuple(params[name] for name in compiled.positiontup)
+            with session.begin_nested():
+                plan = session.connection().exec_driver_sql(
+                    'EXPLAIN (FORMAT JSON) ' + str(compiled), params).scalar()
+            return int(plan[0]['Plan']['Plan Rows'])
+        except Exception:
+            return query.count()
 
     @resourceful.pre_fetch(-1)
     def apply_jsonapi_args(self, query, **kwargs):
         """Return a filtered, sorted, and paginated query."""
         errors = []
-        query, errs = self.filter_query(query, errors)
-        errors.extend(errs)
-        query, errs = self.sort_query(query, errors)
+        query, errs = self.filter_and_sort_query(query, errors)
         errors.extend(errs)
         query, total, errs = self.paginate_query(query, errors)
         errors.extend(errs)
@@ -106,9 +679,258 @@ class QueryMixin(CompoundDocumentMixin):
             return self.raise_jsonapi_errors(errors)
         return query
 
+    @resourceful.post_fetch(1000)
+    def trim_page(self, models):
+        """Return the requested page without the look-ahead row."""
+        page = getattr(self, 'pagination_page', None)
+        if page is None or not isinstance(models, list):
+            return models
+
+        page['more'] = len(models) > page['size']
+        models = models[:page['size']]
+        if page['mode'] != 'keyset':
+            return models
+
+        if page['direction'] == 'prev':
+            models.reverse()
+        keys = page['keys']
+        page['first'] = page['last'] = None
+        if models:
+            page['first'] = [getattr(models[0], key) for key in keys]
+            page['last'] = [getattr(models[-1], key) for key in keys]
+        return models
+
     @resourceful.post_dump
     def paginate_response(self, response):
         """Return a paginated document."""
-        response = self.jsonapi.make_paginated_response(
-            response, self.pagination_url, self.pagination_total)
+        page = getattr(self, 'pagination_page', None)
+        if page is None:
+            return self.jsonapi.make_paginated_response(
+                response, self.pagination_url, self.pagination_total)
+
+        total = self.count_total(self.pagination_count_query)
+        if page['mode'] == 'keyset':
+            links = self.make_keyset_links(page)
+        else:
+            links = self.make_offset_links(page, total)
+        response.setdefault('links', {}).update(links)
+        if total is not None:
+            response.setdefault('meta', {})['total'] = total
         return response
+
+    def make_pagination_link(self, *page_parameters):
+        """Return the pagination URL with a set of page parameters."""
+        parameters = sorted(
+            (key, value) for key, value in self.request_parameters.items()
+            if not key.startswith('page['))
+        return '{}?{}'.format(
+            self.pagination_url, urlencode(parameters + list(page_parameters)))
+
+    def make_offset_links(self, page, total):
+        """Return "first", "prev", "next" and "last" offset links."""
+        offset, size = page['offset'], page['size']
+
+        def make_link(offset):
+            return self.make_pagination_link(
+                ('page[offset]', offset), ('page[limit]', size))
+
+        links = {'first': make_link(0), 'prev': None, 'next': None}
+        if offset > 0:
+            links['prev'] = make_link(max(offset - size, 0))
+        if page.get('more'):
+            links['next'] = make_link(offset + size)
+        if total is not None:
+            links['last'] = make_link(max(total - 1, 0) // size * size)
+        return links
+
+    def make_keyset_links(self, page):
+        """Return "next" and "prev" cursor links."""
+        forwards = page['direction'] == 'next'
+        has_next = page.get('more') if forwards else True
+        has_prev = bool(page['cursor']) if forwards else page.get('more')
+
+        def make_link(direction, values):
+            return self.make_pagination_link(
+                ('page[size]', page['size']),
+                ('page[cursor]', encode_cursor(direction, values)))
+
+        return {
+            'next': make_link('next', page['last']) if (
+                has_next and page.get('last')) else None,
+            'prev': make_link('prev', page['first']) if (
+                has_prev and page.get('first')) else None}
+
+
+class CountInvalidationMixin(object):
+    """Cached collection count invalidation.
+
+    Saving a model or archiving a set of rows invalidates the cached
+    counts of "model".  Counts are invalidated before the save, which
+    also covers DELETE views, and again after it so a count cached in
+    between is discarded.
+
+    Attributes:
+        count_cache (NamespacedCache): Cached count storage.
+    """
+
+    count_cache = QueryMixin.count_cache
+
+    @resourceful.pre_save(-1000)
+    def invalidate_counts_before_save(self, model):
+        """Invalidate the model's cached counts."""
+        self.count_cache.invalidate(count_namespace(self.model))
+        return model
+
+    @resourceful.post_save(1000)
+    def invalidate_counts_after_save(self, model):
+        """Invalidate the model's cached counts."""
+        self.count_cache.invalidate(count_namespace(self.model))
+        return model
+
+    @resourceful.post_archive_all(1000)
+    def invalidate_counts_after_archive(self, count):
+        """Invalidate the model's cached counts."""
+        self.count_cache.invalidate(count_namespace(self.model))
+        return count
+
+
+class ArchivedFilterMixin(object):
+    """Archived row exclusion mixin class.
+
+    Fetch queries are filtered to rows whose "_archive_column" equals
+    "_unarchived_value".  The equality predicate can be served by an
+    index (e.g. a partial index "WHERE NOT is_archived"), so the
+    archive column should be non-nullable.  Set "include_archived" to
+    fetch archived rows as well.
+
+    Attributes:
+        include_archived (bool): Disable the archived row filter.
+    """
+
+    _archive_column = 'is_archived'
+    _unarchived_value = False
+
+    include_archived = False
+
+    @property
+    def unarchived_clause(self):
+        """Return the SQL predicate matching rows not archived."""
+        column = getattr(self.model, self._archive_column)
+        return column == self._unarchived_value
+
+    @resourceful.pre_fetch(1)
+    def exclude_archived(self, query, **kwargs):
+        """Return a query set without archived rows."""
+        if self.include_archived:
+            return query
+        return query.filter(self.unarchived_clause)
+
+
+class BulkArchiveMixin(ArchivedFilterMixin):
+    """Set-based archive mixin class.
+
+    "archive_all" archives every unarchived row matching the request's
+    JSONAPI filters with a single UPDATE instead of loading and saving
+    each model.  "pre_archive_all" processors receive and return the
+    filtered query before the UPDATE and "post_archive_all" processors
+    receive and return the number of archived rows after the commit.
+    Item processors are not invoked.  Filtering is delegated to
+    "QueryMixin.filter_query" so the mixin must be combined with
+    "QueryMixin".  Filters must be expressible in an UPDATE statement
+    (i.e. without joins on dialects lacking "UPDATE ... FROM").
+
+    Attributes:
+        archive_synchronize_session: "synchronize_session" strategy
+            passed to "Query.update".
+    """
+
+    _archive_value = True
+
+    archive_synchronize_session = False
+
+    @abstractmethod
+    def commit(self):
+        """Commit the current transaction."""
+        return None
+
+    def archive_all(self, query) -> int:
+        """Archive the rows matching the request's filters.
+
+        Returns the number of archived rows.
+        """
+        query, errors = self.filter_query(query.filter(
+            self.unarchived_clause), [])
+        if errors:
+            return self.raise_jsonapi_errors(errors)
+
+        query = self.interleave('pre_archive_all', query)
+        count = query.update(
+            {self._archive_column: self._archive_value},
+            synchronize_session=self.archive_synchronize_session)
+        self.commit()
+        self.archived_count = self.interleave('post_archive_all', count)
+        return self.archived_count
+
+
+UNCACHEABLE = object()
+PLAN_ATTRIBUTES = ('_where_criteria', '_order_by_clauses')
+
+
+def is_prefix(prefix, items):
+    """Return True if a sequence starts with the objects of another."""
+    return len(prefix) <= len(items) and all(
+        a is b for a, b in zip(prefix, items))
+
+
+def count_namespace(model):
+    """Return the count cache namespace of a model class."""
+    return getattr(model, '__tablename__', model.__name__)
+
+
+def query_signature(query):
+    """Return a digest of a query's SQL and parameters."""
+    compiled = query.statement.compile()
+    data = '{}\x1f{!r}'.format(compiled, sorted(compiled.params.items()))
+    return hashlib.blake2b(data.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def encode_cursor(direction, values):
+    """Return an opaque pagination cursor."""
+    data = json.dumps([direction, values], default=str, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Return the (direction, values) pair of a pagination cursor."""
+    try:
+        data = base64.urlsafe_b64decode(cursor.encode('ascii'))
+        direction, values = json.loads(data.decode('utf-8'))
+    except (binascii.Error, UnicodeError, TypeError, ValueError):
+        raise ValueError('Invalid pagination cursor.')
+    if not isinstance(values, list):
+        raise ValueError('Invalid pagination cursor.')
+    return direction, values
+
+
+def coerce_value(column, value):
+    """Return a decoded cursor value as the column's Python type.
+
+    Raises "ValueError" for values the type can not represent.
+    """
+    try:
+        python_type = column.type.python_type
+    except (AttributeError, NotImplementedError):
+        return value
+    if value is None or isinstance(value, python_type):
+        return value
+    try:
+        if python_type in (datetime.datetime, datetime.date, datetime.time):
+            return python_type.fromisoformat(value)
+        return python_type(value)
+    except ArithmeticError as exc:
+        raise ValueError(str(exc)) from exc
+
+
+def make_parameter_error(parameter, detail):
+    """Return a JSONAPI error object for a query parameter."""
+    return {'source': {'parameter': parameter}, 'detail': detail}
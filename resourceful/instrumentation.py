@@ -0,0 +1,151 @@
+"""Processor instrumentation module."""
+from abc import abstractmethod
+import bisect
+import collections
+import logging
+import threading
+import time
+
+
+Timing = collections.namedtuple(
+    'Timing', ['view', 'stage', 'processor', 'wall', 'cpu'])
+Timing.__doc__ = """Wall and CPU seconds spent in a processor.
+
+Stage totals are recorded with a "processor" of None.
+"""
+
+
+class Sink:
+    """Timing sink abstraction layer."""
+
+    @abstractmethod
+    def record(self, timing: Timing):
+        """Consume a timing."""
+        return
+
+
+class HistogramSink(Sink):
+    """In-memory, thread-safe timing aggregator.
+
+    Timings are grouped by (view, stage, processor).
+
+    Keyword arguments:
+        buckets (tuple): Ascending wall time bucket bounds in seconds.
+    """
+
+    buckets = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+    def __init__(self, buckets: tuple=None):
+        if buckets is not None:
+            self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def record(self, timing):
+        """Add a timing to its histogram."""
+        key = (timing.view, timing.stage, timing.processor)
+        index = bisect.bisect_left(self.buckets, timing.wall)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {
+                    'count': 0, 'wall': 0.0, 'cpu': 0.0, 'max': 0.0,
+                    'buckets': [0] * (len(self.buckets) + 1)}
+            histogram['count'] += 1
+            histogram['wall'] += timing.wall
+            histogram['cpu'] += timing.cpu
+            histogram['max'] = max(histogram['max'], timing.wall)
+            histogram['buckets'][index] += 1
+
+    def snapshot(self) -> dict:
+        """Return a copy of the aggregated histograms."""
+        with self._lock:
+            return {
+                key: dict(histogram, buckets=list(histogram['buckets']))
+                for key, histogram in self._histograms.items()}
+
+    def clear(self):
+        """Discard the aggregated histograms."""
+        with self._lock:
+            self._histograms.clear()
+
+
+class LoggingSink(Sink):
+    """Log timings at or above a wall time threshold.
+
+    Keyword arguments:
+        logger (logging.Logger): Defaults to the module logger.
+        level (int): Logging level.
+        threshold (float): Minimum wall time in seconds.
+    """
+
+    def __init__(self, logger=None, level=logging.INFO, threshold=0.0):
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+        self.threshold = threshold
+
+    def record(self, timing):
+        """Log a timing."""
+        if timing.wall >= self.threshold:
+            self.logger.log(
+                self.level, '%s.%s %s wall=%.6fs cpu=%.6fs', timing.view,
+                timing.stage, timing.processor or '*', timing.wall,
+                timing.cpu)
+
+
+class CallbackSink(Sink):
+    """Forward timings to a callable (e.g. a StatsD or Prometheus client).
+
+    Keyword arguments:
+        callback (callable): Called with each "Timing".
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def record(self, timing):
+        """Forward a timing."""
+        self.callback(timing)
+
+
+class Instrumentation:
+    """Timed processor chain runner.
+
+    Views run their processors through "run" when their
+    "instrumentation" attribute is set.  Every processor and every
+    stage produces a "Timing" that is passed to each sink and to the
+    view's "record_timing" method.
+
+    Keyword arguments:
+        sinks (list): Timing sinks.
+    """
+
+    def __init__(self, sinks=()):
+        self.sinks = list(sinks)
+
+    def run(self, view, name, arg, kwargs):
+        """Return the argument after passing it through a stage."""
+        processors = view.processors[name]
+        if not processors:
+            return arg
+
+        view_name = type(view).__name__
+        stage_wall, stage_cpu = time.perf_counter(), time.thread_time()
+        for processor in processors:
+            wall, cpu = time.perf_counter(), time.thread_time()
+            try:
+                arg = processor(view, arg, **kwargs)
+            finally:
+                self.emit(view, Timing(
+                    view_name, name, processor.__name__,
+                    time.perf_counter() - wall, time.thread_time() - cpu))
+        self.emit(view, Timing(
+            view_name, name, None, time.perf_counter() - stage_wall,
+            time.thread_time() - stage_cpu))
+        return arg
+
+    def emit(self, view, timing):
+        """Pass a timing to the sinks and the view."""
+        for sink in self.sinks:
+            sink.record(timing)
+        view.record_timing(timing)
@@ -0,0 +1,68 @@
+"""Request-scoped model loader module."""
+
+
+class Loader:
+    """Request-scoped identity map and batch loader.
+
+    Models are cached by (model class, primary key).  "load_many"
+    fetches every key missing from the map with a single "fetch_many"
+    call, so N lookups made by processors cost at most one query per
+    model class.  Keys that were not found are remembered as None and
+    are not fetched again.  Instances already loaded elsewhere (e.g.
+    by the primary fetch) can be added with "prime".
+
+    Keyword arguments:
+        fetch_many (callable): Called with a model class and a list of
+            primary keys.  Returns the instances found, in any order.
+        identity (callable): Called with an instance.  Returns its
+            primary key or None.
+        key (callable): Called with a model class and a requested key.
+            Returns the key in the form "identity" returns (e.g. a URI
+            argument "1" as the integer 1).  Keys are used as given
+            when None.
+    """
+
+    def __init__(self, fetch_many, identity, key=None):
+        self.fetch_many = fetch_many
+        self.identity = identity
+        self.key = key
+        self._models = {}
+
+    def __contains__(self, key):
+        """Return True if a (model, primary key) pair is mapped."""
+        return key in self._models
+
+    def __len__(self):
+        """Return the number of mapped keys."""
+        return len(self._models)
+
+    def prime(self, instance, model=None):
+        """Add a loaded instance to the map and return it."""
+        key = self.identity(instance)
+        if key is not None:
+            self._models[(model or type(instance), key)] = instance
+        return instance
+
+    def load(self, model, key):
+        """Return the instance of a primary key or None."""
+        return self.load_many(model, [key])[0]
+
+    def load_many(self, model, keys):
+        """Return the instances of a list of primary keys in order.
+
+        Keys without a row resolve to None.
+        """
+        if self.key is not None:
+            keys = [self.key(model, key) for key in keys]
+        missing = list(dict.fromkeys(
+            key for key in keys if (model, key) not in self._models))
+        if missing:
+            for instance in self.fetch_many(model, missing):
+                self.prime(instance, model)
+            for key in missing:
+                self._models.setdefault((model, key), None)
+        return [self._models[(model, key)] for key in keys]
+
+    def clear(self):
+        """Discard every mapped instance."""
+        self._models.clear()
@@ -1,16 +1,99 @@
 """Serialization middleware."""
 from abc import abstractmethod
+from resourceful.cache import LRUCache
+
+import itertools
+import threading
+import weakref
+
+
+def qualified_name(cls: type) -> str:
+    """Return the "module.QualName" of a class."""
+    return '{}.{}'.format(cls.__module__, cls.__qualname__)
 
 
 class _SerializerRegistry(type):
-    serializers = {}
+    """Index serializer classes by name, qualified name and resource.
+
+    Every index holds weak references so dynamically created
+    serializers are discarded with their class.  Bare names keep the
+    last defined class; qualified names ("module.QualName") are unique.
+    Classes are indexed by the "model" and "resource_type" attributes
+    they define themselves, not by inherited ones.
+    """
+
+    serializers = weakref.WeakValueDictionary()
+    qualified = weakref.WeakValueDictionary()
+    resources = weakref.WeakValueDictionary()
 
     def __new__(cls, name, bases, attrs):
         new_cls = type.__new__(cls, name, bases, attrs)
         cls.serializers[name] = new_cls
+        cls.qualified[qualified_name(new_cls)] = new_cls
+        for key in (attrs.get('model'), attrs.get('resource_type')):
+            if key is not None:
+                cls.resources[key] = new_cls
         return new_cls
 
 
+class SchemaCache:
+    """Thread-safe LRU cache of schema instances with hit/miss counters.
+
+    Keyword arguments:
+        maxsize (int): Maximum number of cached schema instances.
+    """
+
+    def __init__(self, maxsize: int=256):
+        self.maxsize = maxsize
+        self.clear()
+
+    def get(self, key, factory):
+        """Return the cached instance of a key, creating it if missing.
+
+        Keys that can not be hashed bypass the cache.
+        """
+        try:
+            schema = self._schemas.get(key)
+        except TypeError:
+            schema = None
+            key = None
+        if schema is not None:
+            with self._lock:
+                self.hits += 1
+            return schema
+
+        with self._lock:
+            self.misses += 1
+        schema = factory()
+        if key is not None:
+            self._schemas.set(key, schema)
+        return schema
+
+    def clear(self):
+        """Discard the cached instances and reset the counters."""
+        self._lock = threading.Lock()
+        self._schemas = LRUCache(maxsize=self.maxsize)
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> dict:
+        """Return the cache's counters and size."""
+        return {
+            'hits': self.hits, 'misses': self.misses,
+            'size': len(self._schemas), 'maxsize': self.maxsize}
+
+
+def _freeze(value):
+    """Return a hashable, order-independent version of a value."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    return value
+
+
 class Serializer(metaclass=_SerializerRegistry):
     """Serialization abstraction layer.
 
@@ -25,13 +108,70 @@ class Serializer(metaclass=_SerializerRegistry):
     Complex marshaling and schema generation can be applied here. This
     method should only ever accept one required "model" argument.
 
+    "make_schema" returns a schema instance from a cache shared by
+    every serializer.  Instances are keyed by schema type, field set,
+    "many" and the remaining schema arguments so they are constructed
+    once per distinct combination.  Cached schema instances are shared
+    between threads and must not hold per-call state.
+
+    "serialize_all" splits collections of at least "parallel_threshold"
+    models into chunks of "parallel_chunk_size" and serializes them on
+    "parallel_executor" when one is set.  Thread pools only help when
+    serialization releases the GIL; process pools require a picklable
+    serializer and picklable chunks (see "prepare_chunk").  Chunk
+    results are joined in order by "merge_chunks" and the first failed
+    chunk's exception is raised.
+
+    Serializers defining a "model" or "resource_type" are resolved to a
+    shared instance by "resolve_serializer".  Shared instances are used
+    by every thread and must not hold per-call state.
+
     Attributes:
         fields (iterable): A list or tuple of fields to marshal.
         schema (object): Schema object type.
+        model (type): Model class the serializer is registered for.
+        resource_type (str): Resource type the serializer is
+            registered for (e.g. a JSONAPI "type").
+        schema_cache (SchemaCache): Schema instance cache.
+        parallel_executor (concurrent.futures.Executor): Worker pool.
+        parallel_threshold (int): Minimum collection size serialized
+            in parallel.
+        parallel_chunk_size (int): Number of models per chunk.
     """
 
     fields = None
     schema = None
+    model = None
+    resource_type = None
+    schema_cache = SchemaCache()
+    parallel_executor = None
+    parallel_threshold = 5000
+    parallel_chunk_size = 1000
+
+    def __getstate__(self):
+        """Return the pickled state without the worker pool."""
+        state = dict(self.__dict__)
+        state.pop('parallel_executor', None)
+        return state
+
+    def make_schema(self, fields=None, many=False, **schema_args: dict):
+        """Return a cached schema instance."""
+        if fields is None:
+            fields = self.fields
+        key = (
+            self.schema, None if fields is None else frozenset(fields), many,
+            _freeze(schema_args))
+        return self.schema_cache.get(
+            key, lambda: self.create_schema(fields, many, **schema_args))
+
+    def create_schema(self, fields=None, many=False, **schema_args: dict):
+        """Return a new schema instance.
+
+        Fields are passed as marshmallow's "only" argument by default.
+        """
+        if fields is not None:
+            schema_args['only'] = tuple(fields)
+        return self.schema(many=many, **schema_args)
 
     @abstractmethod
     def deserialize(self, form, many=False, **schema_args: dict):
@@ -49,13 +189,86 @@ class Serializer(metaclass=_SerializerRegistry):
 
     def serialize_all(self, models: list, **schema_args: dict):
         """Return a set of serialized models."""
-        return self.serialize(models, many=True, **schema_args)
+        executor = self.parallel_executor
+        if executor is None or len(models) < self.parallel_threshold:
+            return self.serialize(models, many=True, **schema_args)
+
+        size = self.parallel_chunk_size
+        futures = [
+            executor.submit(
+                self.serialize, self.prepare_chunk(models[index:index + size]),
+                True, **schema_args)
+            for index in range(0, len(models), size)]
+        try:
+            return self.merge_chunks([future.result() for future in futures])
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    def prepare_chunk(self, models: list) -> list:
+        """Return a chunk of models ready to be sent to a worker.
+
+        Override to project models to plain data for process pools.
+        """
+        return models
+
+    def merge_chunks(self, chunks: list):
+        """Return the serialized chunks joined in order.
+
+        Lists are concatenated.  Documents (e.g. JSONAPI "{'data': [...]}")
+        are merged into the first chunk's document by concatenating their
+        "data" lists.  Raises "TypeError" for any other chunk type.
+        """
+        if all(isinstance(chunk, list) for chunk in chunks):
+            return list(itertools.chain.from_iterable(chunks))
+        if all(isinstance(chunk, dict) for chunk in chunks):
+            return dict(chunks[0], data=list(itertools.chain.from_iterable(
+                chunk['data'] for chunk in chunks)))
+        raise TypeError(
+            'Can not merge chunks of type {}; override "merge_chunks".'.format(
+                ', '.join(sorted({type(chunk).__name__ for chunk in chunks}))))
 
 
 def get_serializer(name: str) -> Serializer:
     """Return the requested class or raise.
 
     Keyword arguments:
-        name (str): Serializer class name.
+        name (str): Serializer class name or qualified name
+            ("module.QualName").
     """
+    if '.' in name:
+        return _SerializerRegistry.qualified[name]
     return _SerializerRegistry.serializers[name]
+
+
+def resolve_serializer(key) -> Serializer:
+    """Return the shared serializer instance of a resource or raise.
+
+    Model classes resolve through their bases when they have no
+    serializer of their own.
+
+    Keyword arguments:
+        key: Model class, model instance, resource type, class name or
+            qualified name.
+    """
+    resources = _SerializerRegistry.resources
+    serializer = resources.get(key)
+    if serializer is None:
+        if isinstance(key, str):
+            serializer = get_serializer(key)
+        else:
+            model = key if isinstance(key, type) else type(key)
+            for base in model.__mro__:
+                serializer = resources.get(base)
+                if serializer is not None:
+                    break
+            else:
+                raise KeyError(key)
+
+    instance = serializer.__dict__.get('_instance')
+    if instance is None:
+        instance = serializer()
+        serializer._instance = instance
+    return instance
+
@@ -0,0 +1,82 @@
+"""Deferred task module."""
+import concurrent.futures
+import logging
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+
+class TaskRunner:
+    """Bounded background task runner.
+
+    Tasks run on a pool of "max_workers" threads.  At most
+    "max_pending" tasks are queued or running at a time; once the
+    limit is reached "submit" runs the task in the calling thread, so
+    a backlog slows its producers down instead of growing without
+    bound.  Exceptions raised by a task are logged and passed to
+    "on_error".  Synchronous runners run every task in the calling
+    thread, which makes them suitable for tests.
+
+    Keyword arguments:
+        max_workers (int): Number of worker threads.
+        max_pending (int): Maximum number of queued or running tasks.
+        on_error (callable): Called with the exception of a failed task.
+        synchronous (bool): Run tasks in the calling thread.
+    """
+
+    def __init__(self, max_workers: int=4, max_pending: int=100,
+                 on_error=None, synchronous: bool=False):
+        self.on_error = on_error
+        self.synchronous = synchronous
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        if not synchronous:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers, thread_name_prefix='resourceful-task')
+
+    def submit(self, fn, *args, **kwargs):
+        """Schedule a task and return its future.
+
+        Returns None when the task ran in the calling thread.
+        """
+        if self.synchronous or not self._slots.acquire(blocking=False):
+            self.run(fn, args, kwargs)
+            return None
+
+        future = self._executor.submit(self.run, fn, args, kwargs)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._release)
+        return future
+
+    def run(self, fn, args, kwargs):
+        """Run a task and report its exception."""
+        try:
+            fn(*args, **kwargs)
+        except Exception as exc:
+            logger.exception('Deferred task %r failed.', fn)
+            if self.on_error is not None:
+                self.on_error(exc)
+
+    def flush(self, timeout: float=None) -> bool:
+        """Wait for the pending tasks.
+
+        Returns False if tasks are still pending after "timeout".
+        """
+        with self._lock:
+            pending = list(self._pending)
+        _, not_done = concurrent.futures.wait(pending, timeout)
+        return not not_done
+
+    def shutdown(self, wait: bool=True):
+        """Stop the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait)
+
+    def _release(self, future):
+        with self._lock:
+            self._pending.discard(future)
+        self._slots.release()
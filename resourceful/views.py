@@ -1,9 +1,15 @@
 """View module."""
 from abc import abstractmethod, abstractproperty
 
+from resourceful.pipeline import Pipeline, compile_interleave
+
 import collections
 import contextlib
 import resourceful
+import threading
+
+
+_processors_lock = threading.RLock()
 
 
 def resolve_processors(obj):
@@ -20,16 +26,94 @@ def resolve_processors(obj):
 
 
 class View:
-    """View class."""
+    """View class.
+
+    Processors are resolved once, when the class is created, and
+    stored on the class as a frozen "Pipeline".  Setting
+    "compiled_dispatch" to True replaces "interleave" with a method
+    generated for the class' processor chains.  Setting
+    "instrumentation" to an "Instrumentation" instance times every
+    processor.
+
+    Every class stores its own pipeline, so a class never reads a
+    pipeline inherited from its parent.  Processors attached after
+    class creation with "add_processor" recompile the pipelines of the
+    class and of its subclasses under a lock.  Pipelines are replaced,
+    never mutated, so concurrent requests see either the previous or
+    the next complete chain.
+    """
 
     _code = None
     _method = None
 
+    compiled_dispatch = False
+    instrumentation = None
+    processors = Pipeline()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        with _processors_lock:
+            cls.compile_processors()
+
+    @classmethod
+    def compile_processors(cls):
+        """Resolve and store the class' own pipeline."""
+        processors = Pipeline(resolve_processors(cls))
+        if cls.compiled_dispatch:
+            cls.interleave = compile_interleave(processors)
+        elif getattr(cls.interleave, '__compiled__', False):
+            cls.interleave = View.interleave
+        cls.processors = processors
+
+    @classmethod
+    def add_processor(cls, processor, name: str=None):
+        """Attach a tagged processor to the class.
+
+        Keyword arguments:
+            processor (callable): Function tagged with a stage decorator.
+            name (str): Attribute name.  Defaults to the function's name.
+        """
+        if not hasattr(processor, '__invokation_type__'):
+            raise TypeError('{!r} is not a tagged processor.'.format(
+                processor))
+        with _processors_lock:
+            setattr(cls, name or processor.__name__, processor)
+            cls.refresh_processors()
+
+    @classmethod
+    def refresh_processors(cls):
+        """Recompile the pipelines of the class and of its subclasses."""
+        with _processors_lock:
+            pending, seen = [cls], set()
+            while pending:
+                klass = pending.pop()
+                if klass in seen:
+                    continue
+                seen.add(klass)
+                klass.compile_processors()
+                pending.extend(klass.__subclasses__())
+
     def interleave(self, name, arg, **kwargs):
-        for processor in self.processors[name]:
+        if self.instrumentation is not None:
+            return self.instrumentation.run(self, name, arg, kwargs)
+        processors = self.processors.stages.get(name, ())
+        if not processors:
+            return arg
+        if len(processors) == 1:
+            return processors[0](self, arg, **kwargs)
+        for processor in processors:
             arg = processor(self, arg, **kwargs)
         return arg
 
+    @property
+    def schema_args(self):
+        """Return keyword arguments passed to the serializer."""
+        return {}
+
+    def record_timing(self, timing):
+        """Receive an instrumented processor or stage timing."""
+        return None
+
 
 class ReadView(View):
     """Resource read view."""
@@ -93,3 +177,73 @@ class DeleteView(DeleteMixin, View):
         """
         model = self.interleave('pre_save', model)
         self.delete_action(model)
+
+
+class BulkMixin:
+    """Common bulk request behavior.
+
+    Bulk views accept a list payload.  Item processors ("pre_load",
+    "post_load", "pre_save", "post_save", "pre_dump") run once per item
+    while "pre_save_all", "post_save_all" and "post_dump" processors
+    run once per batch.  Serialization is delegated to the "many"
+    methods of the view's "serializer" and every request persists the
+    batch with one "save_all_action" call and one "commit".
+    """
+
+    @abstractmethod
+    def save_all_action(self, models):
+        """Persist a list of models."""
+        return None
+
+    @abstractmethod
+    def commit(self):
+        """Commit the current transaction."""
+        return None
+
+    def load_all(self, forms):
+        """Return a list of deserialized dictionaries."""
+        forms = [self.interleave('pre_load', form) for form in forms]
+        data = self.serializer.deserialize_all(forms)
+        return [self.interleave('post_load', item) for item in data]
+
+    def save_all(self, models):
+        """Persist and commit a list of models."""
+        models = [self.interleave('pre_save', model) for model in models]
+        models = self.interleave('pre_save_all', models)
+        self.save_all_action(models)
+        self.commit()
+        models = self.interleave('post_save_all', models)
+        return [self.interleave('post_save', model) for model in models]
+
+    def dump_all(self, models):
+        """Return a serialized list of models."""
+        models = [self.interleave('pre_dump', model) for model in models]
+        response = self.serializer.serialize_all(models, **self.schema_args)
+        return self.interleave('post_dump', response)
+
+
+class BulkCreateView(BulkMixin, CreateView):
+    """Resource bulk create view."""
+
+
+class BulkUpdateView(BulkMixin, UpdateView):
+    """Resource bulk update view."""
+
+
+class BulkDeleteView(BulkMixin, DeleteView):
+    """Resource bulk delete view."""
+
+    @abstractmethod
+    def delete_all_action(self, models):
+        """Delete a list of models."""
+        return None
+
+    def save_all(self, models):
+        """Delete a list of models and return "None".
+
+        Post-save processors are not invoked for DELETE views.
+        """
+        models = [self.interleave('pre_save', model) for model in models]
+        models = self.interleave('pre_save_all', models)
+        self.delete_all_action(models)
+        self.commit()
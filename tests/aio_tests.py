@@ -0,0 +1,86 @@
+from unittest import TestCase
+
+import asyncio
+
+from resourceful.aio import *
+from resourceful.decorators import *
+
+
+class AsyncViewsTestCase(TestCase):
+
+    def test_async_views(self):
+        """Test asynchronous views keep their HTTP interactions."""
+        self.assertTrue(AsyncReadView._method == 'GET')
+        self.assertTrue(AsyncCreateView._code == 201)
+        self.assertTrue(AsyncPartialUpdateView._method == 'PATCH')
+        self.assertTrue(AsyncArchiveView._code == 204)
+        self.assertTrue(AsyncDeleteView._method == 'DELETE')
+
+    def test_interleave(self):
+        """Test coroutine and synchronous processors are chained."""
+        class TestView(AsyncView):
+            @pre_fetch(2)
+            async def a(self, arg, **kwargs):
+                await asyncio.sleep(0)
+                return arg + ['a']
+
+            @pre_fetch(1)
+            def b(self, arg, **kwargs):
+                return arg + [kwargs]
+
+        result = asyncio.run(TestView().interleave('pre_fetch', [], x=1))
+        self.assertTrue(result == ['a', {'x': 1}])
+        self.assertTrue(asyncio.run(TestView().interleave('post_dump', 1)) == 1)
+
+    def test_interleave_independent(self):
+        """Test independent processors run concurrently."""
+        events = []
+
+        class TestView(AsyncView):
+            @independent
+            @post_save(2)
+            async def a(self, arg):
+                events.append('a-start')
+                await asyncio.sleep(0)
+                events.append('a-end')
+                return 'ignored'
+
+            @independent
+            @post_save(2)
+            async def b(self, arg):
+                events.append('b-start')
+                await asyncio.sleep(0)
+                events.append('b-end')
+
+            @post_save(1)
+            def c(self, arg):
+                events.append('c')
+                return arg + 1
+
+        self.assertTrue(asyncio.run(TestView().interleave('post_save', 1)) == 2)
+        self.assertTrue(events == ['a-start', 'b-start', 'a-end', 'b-end', 'c'])
+
+    def test_archive_view(self):
+        """Test synchronous processors run in asynchronous views."""
+        class Model:
+            is_archived = False
+
+        model = asyncio.run(AsyncArchiveView().interleave('pre_save', Model()))
+        self.assertTrue(model.is_archived is True)
+
+    def test_delete_view(self):
+        """Test deleting with a coroutine delete action."""
+        deleted = []
+
+        class TestView(AsyncDeleteView):
+            async def delete_action(self, model):
+                deleted.append(model)
+
+        self.assertTrue(asyncio.run(TestView().save(1)) is None)
+        self.assertTrue(deleted == [1])
+
+    def test_compiled_dispatch(self):
+        """Test compiled dispatch is rejected."""
+        with self.assertRaises(TypeError):
+            class TestView(AsyncView):
+                compiled_dispatch = True
@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+from resourceful.cache import *
+
+
+class Clock:
+
+    def __init__(self):
+        self.time = 0
+
+    def __call__(self):
+        return self.time
+
+
+class CacheTestCase(TestCase):
+
+    def test_lru_cache(self):
+        """Test the least recently used key is evicted."""
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertTrue(cache.get('a') == 1)
+        cache.set('c', 3)
+        self.assertTrue(cache.get('b') is None)
+        self.assertTrue(cache.get('a') == 1)
+        self.assertTrue(len(cache) == 2)
+
+        cache.delete('a')
+        self.assertTrue(cache.get('a') is None)
+
+    def test_lru_cache_ttl(self):
+        """Test keys expire after their time to live."""
+        clock = Clock()
+        cache = LRUCache(ttl=10, clock=clock)
+        cache.set('a', 1)
+        cache.set('b', 2, ttl=20)
+        clock.time = 10
+        self.assertTrue(cache.get('a') is None)
+        self.assertTrue(cache.get('b') == 2)
+        clock.time = 20
+        self.assertTrue(cache.get('b') is None)
+
+    def test_response_cache(self):
+        """Test storing and invalidating responses."""
+        cache = ResponseCache()
+        key = cache.key('users', '/users/1', '')
+        self.assertTrue(cache.key('users', '/users/1', '') == key)
+        self.assertTrue(cache.get(key) is None)
+
+        etag = cache.set(key, b'{}')
+        self.assertTrue(etag == make_etag(b'{}'))
+        self.assertTrue(cache.get(key) == (etag, b'{}'))
+
+        cache.invalidate('users')
+        self.assertTrue(cache.key('users', '/users/1', '') != key)
+        self.assertTrue(cache.get(cache.key('users', '/users/1', '')) is None)
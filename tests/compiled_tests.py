@@ -0,0 +1,82 @@
+from nose.tools import assert_raises
+from unittest import TestCase
+
+from resourceful.compiled import *
+from resourceful.errors import ValidationError
+
+
+class UserSerializer(CompiledSerializer):
+    fields = {
+        'first-name': Field(str, required=True),
+        'age': Field(int, validate=lambda value: value >= 0),
+        'score': Field(float, default=0.0),
+        'tags': Field(list, allow_none=True),
+        'joined': Field(int, attribute='joined_at'),
+        'code': Field(lambda value: int(value, 16)),
+    }
+
+
+class CompiledSerializerTestCase(TestCase):
+
+    def test_deserialize(self):
+        """Test declared fields are converted and unknown keys skipped."""
+        form = {'data': {'attributes': {
+            'first-name': 'George', 'age': 3, 'score': 1, 'tags': None,
+            'joined': 10, 'code': 'ff', 'unknown': 1}}}
+        self.assertTrue(UserSerializer().deserialize(form) == {
+            'first_name': 'George', 'age': 3, 'score': 1.0, 'tags': None,
+            'joined_at': 10, 'code': 255})
+
+    def test_deserialize_defaults(self):
+        """Test missing optional fields use their defaults."""
+        form = {'data': {'attributes': {'first-name': 'George'}}}
+        self.assertTrue(UserSerializer().deserialize(form) == {
+            'first_name': 'George', 'score': 0.0})
+
+    def test_deserialize_partial(self):
+        """Test partial deserialization skips required fields and defaults."""
+        form = {'data': {'attributes': {}}}
+        self.assertTrue(UserSerializer().deserialize(form, partial=True) == {})
+        form = {'data': {'attributes': {'score': 2}}}
+        self.assertTrue(UserSerializer().deserialize(form, partial=True) == {
+            'score': 2.0})
+
+    def test_deserialize_errors(self):
+        """Test every error is reported in one pass."""
+        form = {'data': {'attributes': {
+            'age': -1, 'score': 'a', 'tags': {}, 'joined': True,
+            'code': 'z'}}}
+        with assert_raises(ValidationError) as context:
+            UserSerializer().deserialize(form)
+        pointers = [
+            error['source']['pointer'] for error in context.exception.errors]
+        self.assertTrue(pointers == [
+            '/data/attributes/first-name', '/data/attributes/age',
+            '/data/attributes/score', '/data/attributes/tags',
+            '/data/attributes/joined', '/data/attributes/code'])
+
+    def test_deserialize_all(self):
+        """Test lists of forms are validated with item pointers."""
+        forms = [
+            {'data': {'attributes': {'first-name': 'George'}}},
+            {'data': {'attributes': {'first-name': None}}},
+            {'data': []}]
+        with assert_raises(ValidationError) as context:
+            UserSerializer().deserialize_all(forms)
+        self.assertTrue(context.exception.errors == [
+            {'detail': 'Field may not be null.',
+             'source': {'pointer': '/1/data/attributes/first-name'}},
+            {'detail': 'Not a valid object.',
+             'source': {'pointer': '/2/data'}}])
+
+        result = UserSerializer().deserialize_all(forms[:1])
+        self.assertTrue(result == [{'first_name': 'George', 'score': 0.0}])
+
+    def test_flat_envelope(self):
+        """Test serializers without an envelope read flat forms."""
+        class FlatSerializer(CompiledSerializer):
+            envelope = None
+            fields = {'id': Field(int, required=True)}
+
+        self.assertTrue(FlatSerializer().deserialize({'id': 1}) == {'id': 1})
+        assert_raises(ValidationError, FlatSerializer().deserialize, [])
@@ -0,0 +1,54 @@
+from nose.tools import assert_raises
+from unittest import TestCase
+
+from resourceful.context import *
+
+
+class UsersContext(RequestContext):
+    run_task: bool = False
+    account_id: int
+
+
+class AdminContext(UsersContext):
+    role: str = 'admin'
+
+
+class ContextTestCase(TestCase):
+
+    def test_declared_keys(self):
+        """Test declared keys are stored in slots."""
+        context = UsersContext()
+        self.assertTrue(UsersContext.__slots__ == ('run_task', 'account_id'))
+        self.assertTrue(context['run_task'] is False)
+        self.assertTrue('account_id' not in context)
+        assert_raises(KeyError, context.__getitem__, 'account_id')
+
+        context['account_id'] = 1
+        self.assertTrue(context.account_id == 1)
+        self.assertTrue(context['account_id'] == 1)
+        self.assertTrue(context._extra == {})
+
+        del context['account_id']
+        self.assertTrue('account_id' not in context)
+        assert_raises(KeyError, context.__delitem__, 'account_id')
+
+    def test_extra_keys(self):
+        """Test undeclared keys fall back to a dictionary."""
+        context = UsersContext(page=2)
+        context['first-name'] = 'George'
+        self.assertTrue(context['first-name'] == 'George')
+        self.assertTrue(context.get('missing', 1) == 1)
+        self.assertTrue(context.setdefault('items', []) == [])
+        self.assertTrue(context.as_dict() == {
+            'run_task': False, 'page': 2, 'first-name': 'George',
+            'items': []})
+        self.assertTrue(len(context) == 4)
+        assert_raises(AttributeError, setattr, context, 'page', 3)
+
+    def test_inherited_keys(self):
+        """Test subclasses inherit declared keys and defaults."""
+        context = AdminContext(account_id=1)
+        self.assertTrue(AdminContext.__keys__ == frozenset(
+            ['run_task', 'account_id', 'role']))
+        self.assertTrue(context.as_dict() == {
+            'account_id': 1, 'role': 'admin', 'run_task': False})
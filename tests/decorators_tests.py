@@ -59,6 +59,22 @@ class DecoratorsTestCase(TestCase):
         self.assertTrue(test.__invokation_type__ == 'post_save')
         self.assertTrue(test.__invokation_priority__ == 2)
 
+    def test_pre_save_all(self):
+        @pre_save_all(5)
+        def test():
+            pass
+
+        self.assertTrue(test.__invokation_type__ == 'pre_save_all')
+        self.assertTrue(test.__invokation_priority__ == 5)
+
+    def test_post_save_all(self):
+        @post_save_all
+        def test():
+            pass
+
+        self.assertTrue(test.__invokation_type__ == 'post_save_all')
+        self.assertTrue(test.__invokation_priority__ == 0)
+
     def test_pre_dump(self):
         @pre_dump(2)
         def test():
@@ -77,6 +93,15 @@ class DecoratorsTestCase(TestCase):
         self.assertTrue(test.__invokation_type__ == 'post_dump')
         self.assertTrue(test.__invokation_priority__ == 0)
 
+    def test_independent(self):
+        @independent
+        @post_save
+        def test():
+            pass
+
+        self.assertTrue(test.__invokation_type__ == 'post_save')
+        self.assertTrue(test.__invokation_independent__ is True)
+
     def test_tag_processor(self):
         def test():
             pass
@@ -0,0 +1,65 @@
+from nose.tools import assert_raises
+from unittest import SkipTest, TestCase
+
+import datetime
+import decimal
+import json
+import uuid
+
+from resourceful.encoders import *
+
+
+class EncodersTestCase(TestCase):
+
+    document = {
+        'data': {
+            'id': '1', 'type': 'users',
+            'attributes': {'name': 'Zoë', 'created': datetime.date(2017, 1, 1)}
+        }
+    }
+
+    def test_json_encoder(self):
+        """Test the standard library encoder returns compact bytes."""
+        output = JSONEncoder().dumps(self.document)
+        self.assertTrue(isinstance(output, bytes))
+        self.assertTrue(b' ' not in output)
+        self.assertTrue(json.loads(output.decode('utf-8'))['data'][
+            'attributes'] == {'name': 'Zoë', 'created': '2017-01-01'})
+
+    def test_encoders_agree(self):
+        """Test every installed encoder produces the same document."""
+        expected = json.loads(JSONEncoder().dumps(self.document).decode())
+        for name in ENCODERS:
+            try:
+                encoder = get_encoder(name)
+            except ImportError:
+                continue
+            self.assertTrue(encoder.name == name)
+            output = encoder.dumps(self.document)
+            self.assertTrue(json.loads(output.decode('utf-8')) == expected)
+
+    def test_get_encoder(self):
+        """Test the default encoder is the fastest installed."""
+        self.assertTrue(isinstance(get_encoder(), Encoder))
+        self.assertTrue(isinstance(get_encoder('json'), JSONEncoder))
+        assert_raises(KeyError, get_encoder, 'unknown')
+
+    def test_default_types(self):
+        """Test known types are encoded and unknown types rejected."""
+        encoder = JSONEncoder()
+        identifier = uuid.UUID(int=1)
+        output = encoder.dumps([decimal.Decimal('1.5'), identifier])
+        self.assertTrue(json.loads(output.decode('utf-8')) == [
+            '1.5', str(identifier)])
+        assert_raises(TypeError, encoder.dumps, object())
+
+    def test_orjson_encoder_fallback(self):
+        """Test documents orjson rejects are still encoded."""
+        try:
+            encoder = get_encoder('orjson')
+        except ImportError:
+            raise SkipTest('orjson is not installed.')
+        self.assertTrue(encoder.dumps({1: 10}) == b'{"1":10}')
+        self.assertTrue(
+            encoder.dumps([2 ** 70]) == str([2 ** 70]).encode('utf-8'))
+        assert_raises(TypeError, encoder.dumps, object())
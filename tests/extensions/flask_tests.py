@@ -0,0 +1,421 @@
+from flask import Flask
+from nose.tools import assert_raises
+from unittest import TestCase
+
+import json
+import threading
+
+from resourceful.cache import *
+from resourceful.context import *
+from resourceful.decorators import *
+from resourceful.encoders import *
+from resourceful.extensions.flask import *
+from resourceful.instrumentation import *
+from resourceful.tasks import *
+from resourceful.views import *
+
+
+class TestSerializer:
+
+    def serialize_all(self, models):
+        return {'data': [{'id': str(model)} for model in models]}
+
+
+class DetailView(FlaskResourcefulView, ReadView):
+
+    def dispatch_request(self, id):
+        return self.send_response({'data': {'id': id}}, self._code)
+
+
+class StreamView(FlaskResourcefulView, ReadView):
+    serializer = TestSerializer()
+    stream_chunk_size = 2
+
+    def dispatch_request(self):
+        return self.send_stream(iter(range(5)), self._code)
+
+
+class FlaskTestCase(TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.api = FlaskResourceful()
+        self.api.init_app(self.app)
+        self.client = self.app.test_client()
+
+    def test_send_response(self):
+        """Test responses are encoded by the extension's encoder."""
+        self.api.add_views('/users/<id>', [DetailView])
+        response = self.client.get('/users/1')
+        self.assertTrue(response.status_code == 200)
+        self.assertTrue(response.mimetype == 'application/json')
+        self.assertTrue(response.data == b'{"data":{"id":"1"}}')
+
+    def test_encoder_option(self):
+        """Test selecting an encoder by name."""
+        api = FlaskResourceful(encoder='json')
+        self.assertTrue(isinstance(api.encoder, JSONEncoder))
+
+        encoder = JSONEncoder()
+        self.assertTrue(FlaskResourceful(encoder=encoder).encoder is encoder)
+
+    def test_add_routes(self):
+        """Test registering several routes at once."""
+        self.api.add_routes({'/users/<id>': [DetailView]})
+        self.api.add_routes([('/accounts/<id>', [DetailView])])
+        self.assertTrue(self.client.get('/users/1').status_code == 200)
+        self.assertTrue(self.client.get('/accounts/1').status_code == 200)
+
+    def test_loader(self):
+        """Test the request loader batches fetches and is torn down."""
+        fetches, loaders = [], []
+
+        class TestView(DetailView):
+            def fetch_many(self, model, keys):
+                fetches.append(keys)
+                return [{'id': key} for key in keys]
+
+            def identity(self, obj):
+                return obj['id']
+
+            def dispatch_request(self, id):
+                self.loader.load_many(dict, [id, '2'])
+                model = self.loader.load(dict, id)
+                loaders.append(self.loader)
+                return self.send_response({'data': model}, self._code)
+
+        self.api.add_views('/users/<id>', [TestView])
+        response = self.client.get('/users/1')
+        self.assertTrue(response.data == b'{"data":{"id":"1"}}')
+        self.assertTrue(fetches == [['1', '2']])
+        self.assertTrue(len(loaders[0]) == 0)
+
+    def test_deferred_processors(self):
+        """Test after-response processors run once the response closes."""
+        calls = []
+
+        class TestView(DeferredProcessorMixin, FlaskResourcefulView,
+                       UpdateView):
+            def dispatch_request(self, id):
+                model = self.interleave('post_save', {'id': id}, x=1)
+                calls.append('response')
+                return self.send_response(model, self._code)
+
+            @after_response
+            def run_task(self, model, **kwargs):
+                calls.append((model, kwargs))
+
+        self.api.add_views('/users/<id>', [TestView])
+        response = self.client.put('/users/1')
+        self.assertTrue(response.status_code == 202)
+        response.close()
+        self.assertTrue(calls == ['response', ({'id': '1'}, {'x': 1})])
+
+    def test_deferred_processors_independent(self):
+        """Test each after-response processor receives the saved model."""
+        calls, errors = [], []
+
+        class TestView(DeferredProcessorMixin, FlaskResourcefulView,
+                       UpdateView):
+            task_runner = TaskRunner(
+                synchronous=True, on_error=errors.append)
+
+            def dispatch_request(self, id):
+                model = self.interleave('post_save', {'id': id})
+                return self.send_response(model, self._code)
+
+            @after_response(10)
+            def send_email(self, model):
+                calls.append(('email', model))
+                raise ValueError(model)
+
+            @after_response
+            def index(self, model):
+                calls.append(('index', model))
+
+        self.api.add_views('/users/<id>', [TestView])
+        self.client.put('/users/1').close()
+        self.assertTrue(calls == [
+            ('email', {'id': '1'}), ('index', {'id': '1'})])
+        self.assertTrue(len(errors) == 1)
+
+    def test_deferred_processors_task_runner(self):
+        """Test after-response processors are submitted to the runner."""
+        calls = []
+        runner = TaskRunner(max_workers=1)
+
+        class TestView(DeferredProcessorMixin, FlaskResourcefulView,
+                       UpdateView):
+            task_runner = runner
+
+            def dispatch_request(self, id):
+                model = self.interleave('post_save', {'id': id})
+                return self.send_response(model, self._code)
+
+            @after_response
+            def run_task(self, model):
+                calls.append(threading.current_thread())
+
+        self.api.add_views('/users/<id>', [TestView])
+        self.client.put('/users/1').close()
+        self.assertTrue(runner.flush(timeout=5))
+        runner.shutdown()
+        self.assertTrue(len(calls) == 1)
+        self.assertTrue(calls[0] is not threading.current_thread())
+
+    def test_merge_routes(self):
+        """Test a route's views share one method dispatched rule."""
+        class UpdateUserView(FlaskResourcefulView, UpdateView):
+            def dispatch_request(self, id):
+                return self.send_response({'updated': id}, self._code)
+
+        api = FlaskResourceful(merge_routes=True)
+        api.init_app(self.app)
+        api.add_views('/users/<id>', [DetailView, UpdateUserView])
+
+        rules = list(self.app.url_map.iter_rules('/users/<id>'))
+        self.assertTrue(len(rules) == 1)
+        self.assertTrue({'GET', 'HEAD', 'PUT'} <= rules[0].methods)
+
+        response = self.client.get('/users/1')
+        self.assertTrue(response.data == b'{"data":{"id":"1"}}')
+        response = self.client.put('/users/1')
+        self.assertTrue(response.data == b'{"updated":"1"}')
+        self.assertTrue(self.client.head('/users/1').status_code == 200)
+        self.assertTrue(self.client.delete('/users/1').status_code == 405)
+
+    def test_merge_routes_repeated(self):
+        """Test repeated registrations extend a route's table."""
+        class UpdateUserView(FlaskResourcefulView, UpdateView):
+            def dispatch_request(self, id):
+                return self.send_response({'updated': id}, self._code)
+
+        class DeleteUserView(FlaskResourcefulView, DeleteView):
+            def dispatch_request(self, id):
+                return self.send_response({}, self._code)
+
+        api = FlaskResourceful(merge_routes=True)
+        api.init_app(self.app)
+        api.add_views('/users/<id>', [DetailView])
+        api.add_views('/users/<id>', [UpdateUserView])
+
+        response = self.client.put('/users/1')
+        self.assertTrue(response.data == b'{"updated":"1"}')
+        self.assertTrue(self.client.get('/users/1').status_code == 200)
+        assert_raises(
+            ValueError, api.add_views, '/users/<id>', [UpdateUserView])
+        assert_raises(
+            ValueError, api.add_views, '/users/<id>',
+            [DeleteUserView, ArchiveView])
+        self.assertTrue(self.client.delete('/users/1').status_code == 405)
+        self.assertTrue(
+            len(list(self.app.url_map.iter_rules('/users/<id>'))) == 1)
+        response = self.client.options('/users/1')
+        self.assertTrue(response.headers['Allow'] == 'GET, HEAD, OPTIONS, PUT')
+
+    def test_record_timing(self):
+        """Test the processor breakdown is stored in the context."""
+        breakdown = []
+
+        class TestView(DetailView):
+            instrumentation = Instrumentation()
+
+            @post_dump
+            def add_meta(self, response):
+                response['meta'] = {}
+                return response
+
+            def dispatch_request(self, id):
+                data = self.interleave('post_dump', {})
+                breakdown.extend(self['resourceful_timings'])
+                return self.send_response(data, self._code)
+
+        self.api.add_views('/users/<id>', [TestView])
+        self.client.get('/users/1')
+        self.assertTrue([timing.processor for timing in breakdown] == [
+            'add_meta', None])
+
+    def test_context(self):
+        """Test each request gets its own context."""
+        contexts = []
+
+        class TestContext(RequestContext):
+            visits: int = 0
+
+        class TestView(DetailView):
+            context_class = TestContext
+
+            @post_fetch
+            def visit(self, model):
+                self['visits'] += 1
+                self['model'] = model
+                return model
+
+            def dispatch_request(self, id):
+                self.interleave('post_fetch', id)
+                contexts.append(self.context)
+                return self.send_response(dict(self.__dict__.as_dict()), 200)
+
+        self.api.add_views('/users/<id>', [TestView])
+        response = self.client.get('/users/1')
+        self.assertTrue(response.data == b'{"visits":1,"model":"1"}')
+        self.client.get('/users/2')
+        self.assertTrue(contexts[0] is not contexts[1])
+        self.assertTrue(contexts[1].visits == 1)
+        self.assertTrue(contexts[1]['model'] == '2')
+
+    def test_send_stream(self):
+        """Test streaming a collection in chunks."""
+        self.api.add_views('/stream', [StreamView])
+        response = self.client.get('/stream')
+        self.assertTrue(response.status_code == 200)
+        self.assertTrue(response.mimetype == 'application/json')
+        self.assertTrue(json.loads(response.data.decode('utf-8')) == {
+            'data': [{'id': str(index)} for index in range(5)]})
+
+    def test_send_stream_chunks(self):
+        """Test chunk processors run once per chunk."""
+        chunks = []
+
+        class TestView(StreamView):
+            stream_envelope = None
+
+            @post_dump_chunk
+            def drop_odd(self, items):
+                chunks.append(len(items))
+                return [item for item in items if int(item['id']) % 2 == 0]
+
+        self.api.add_views('/stream', [TestView])
+        response = self.client.get('/stream')
+        self.assertTrue(chunks == [])
+        self.assertTrue(json.loads(response.data.decode('utf-8')) == [
+            {'id': '0'}, {'id': '2'}, {'id': '4'}])
+        self.assertTrue(chunks == [2, 2, 1])
+
+
+class CacheTestCase(TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.api = FlaskResourceful()
+        self.api.init_app(self.app)
+        self.client = self.app.test_client()
+        self.cache = ResponseCache()
+        self.fetches = []
+        fetches = self.fetches
+        cache = self.cache
+
+        class ReadUserView(ResponseCacheMixin, DetailView):
+            response_cache = cache
+            cache_namespace = 'users'
+
+            def dispatch_request(self, id):
+                query = self.interleave('pre_fetch', None, id=id)
+                fetches.append(id)
+                data = self.interleave('post_dump', {'data': {'id': id}})
+                return self.send_response(data, self._code)
+
+        class UpdateUserView(CacheInvalidationMixin, FlaskResourcefulView,
+                             UpdateView):
+            response_cache = cache
+            cache_namespace = 'users'
+
+            def dispatch_request(self, id):
+                return self.send_response({}, self._code)
+
+        self.api.add_views('/users/<id>', [ReadUserView, UpdateUserView])
+
+    def test_cached_response(self):
+        """Test a cached response skips fetching."""
+        response = self.client.get('/users/1')
+        self.assertTrue(response.status_code == 200)
+        self.assertTrue(response.data == b'{"data":{"id":"1"}}')
+        etag = response.headers['ETag']
+
+        response = self.client.get('/users/1')
+        self.assertTrue(response.status_code == 200)
+        self.assertTrue(response.data == b'{"data":{"id":"1"}}')
+        self.assertTrue(response.headers['ETag'] == etag)
+        self.assertTrue(self.fetches == ['1'])
+
+        self.client.get('/users/1?b=1&a=2')
+        self.client.get('/users/1?a=2&b=1')
+        self.assertTrue(self.fetches == ['1', '1'])
+
+    def test_cache_vary(self):
+        """Test responses are cached per "Authorization" header."""
+        self.client.get('/users/1', headers={'Authorization': 'a'})
+        self.client.get('/users/1', headers={'Authorization': 'b'})
+        self.client.get('/users/1', headers={'Authorization': 'a'})
+        self.client.get('/users/1')
+        self.assertTrue(self.fetches == ['1', '1', '1'])
+
+    def test_weak_conditional_request(self):
+        """Test "If-None-Match" uses the weak comparison."""
+        etag = self.client.get('/users/1').headers['ETag']
+        response = self.client.get('/users/1', headers={
+            'If-None-Match': 'W/' + etag})
+        self.assertTrue(response.status_code == 304)
+
+    def test_conditional_request(self):
+        """Test a matching "If-None-Match" header returns 304."""
+        etag = self.client.get('/users/1').headers['ETag']
+        response = self.client.get('/users/1', headers={
+            'If-None-Match': etag})
+        self.assertTrue(response.status_code == 304)
+        self.assertTrue(response.data == b'')
+
+        self.cache.invalidate('users')
+        response = self.client.get('/users/1', headers={
+            'If-None-Match': etag})
+        self.assertTrue(response.status_code == 304)
+        self.assertTrue(self.fetches == ['1', '1'])
+
+    def test_cache_invalidation(self):
+        """Test a successful write invalidates the namespace."""
+        self.client.get('/users/1')
+        self.client.put('/users/1')
+        self.client.get('/users/1')
+        self.assertTrue(self.fetches == ['1', '1'])
+
+    def test_model_namespace(self):
+        """Test writes invalidate every route of the model."""
+        cache = self.cache
+        fetches = self.fetches
+
+        class User:
+            __tablename__ = 'users'
+
+        class BrowseUserView(ResponseCacheMixin, FlaskResourcefulView,
+                             ReadView):
+            response_cache = cache
+            model = User
+
+            def dispatch_request(self):
+                self.interleave('pre_fetch', None)
+                fetches.append('all')
+                data = self.interleave('post_dump', {'data': []})
+                return self.send_response(data, self._code)
+
+        class EditUserView(CacheInvalidationMixin, FlaskResourcefulView,
+                           UpdateView):
+            response_cache = cache
+            model = User
+
+            def dispatch_request(self, id):
+                return self.send_response({}, self._code)
+
+        self.api.add_views('/users', [BrowseUserView])
+        self.api.add_views('/users/<id>/edit', [EditUserView])
+        self.client.get('/users')
+        self.client.get('/users')
+        self.client.put('/users/1/edit')
+        self.client.get('/users')
+        self.assertTrue(self.fetches == ['all', 'all'])
+
+    def test_missing_namespace(self):
+        """Test a cached view without a namespace or model fails."""
+        class NoNamespaceView(ResponseCacheMixin, DetailView):
+            response_cache = self.cache
+
+        assert_raises(ValueError, resource_namespace, NoNamespaceView())
@@ -0,0 +1,578 @@
+from unittest import SkipTest, TestCase
+
+try:
+    from sqlalchemy import (
+        Boolean, Column, ForeignKey, Integer, Numeric, String, create_engine,
+        event, func)
+    from sqlalchemy import inspect
+    from sqlalchemy.orm import (
+        declarative_base, joinedload, relationship, Session)
+except ImportError:
+    raise SkipTest('SQLAlchemy is not installed.')
+
+from nose.tools import assert_raises
+from resourceful.cache import LRUCache, NamespacedCache
+from resourceful.decorators import post_archive_all, pre_archive_all
+from resourceful.extensions.jsonapi import *
+from resourceful.loader import Loader
+from resourceful.views import View
+from urllib.parse import unquote
+
+
+Base = declarative_base()
+
+
+class Account(Base):
+    __tablename__ = 'accounts'
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+
+class User(Base):
+    __tablename__ = 'users'
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    email = Column(String)
+    account_id = Column(Integer, ForeignKey('accounts.id'))
+    account = relationship(Account)
+
+
+class JSONAPIQuery:
+
+    def __init__(self):
+        self.parsed = 0
+
+    def make_include_fields(self):
+        self.parsed += 1
+        return ['account'], []
+
+    def make_query_includes(self, fields):
+        return 'mappers', 'selects', 'schemas'
+
+    def make_included_response(self, response, models, schemas):
+        response['included'] = [{'id': model.id} for model in models]
+        return response
+
+
+class DatabaseTestCase(TestCase):
+    """Test case with a seeded in-memory database."""
+
+    def setUp(self):
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        self.session = Session(engine)
+        self.seed(self.session)
+        self.session.commit()
+
+    def tearDown(self):
+        self.session.close()
+
+    def seed(self, session):
+        session.add_all([Account(id=1, name='a'), Account(id=2, name='b')])
+        session.add_all([
+            User(id=index, name=str(index), email='{}@a'.format(index),
+                 account_id=index % 2 + 1) for index in range(5)])
+
+
+class UsersQueryView(QueryMixin):
+    model = User
+
+    def raise_jsonapi_errors(self, errors):
+        raise ValueError(errors)
+
+
+class CompoundDocumentTestCase(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        session = self.session
+        batches = self.batches = []
+
+        class UsersView(CompoundDocumentMixin):
+            include_batch_size = 2
+            include_parameter = 'account'
+            jsonapi = JSONAPIQuery()
+            model = User
+            session = self.session
+
+            def query_includes(self, selects, mappers, model_ids):
+                batches.append(model_ids)
+                return session.query(Account).join(User).filter(
+                    User.id.in_(model_ids)).all() + [None]
+
+        self.view = UsersView
+        self.response = {'data': [{'id': index} for index in range(5)]}
+
+    def test_include_batches(self):
+        """Test includes are queried in bounded, de-duplicated batches."""
+        response = self.view().compound_response(self.response)
+        self.assertTrue(self.batches == [[0, 1], [2, 3], [4]])
+        self.assertTrue(response['included'] == [{'id': 1}, {'id': 2}])
+
+    def test_include_plan_cache(self):
+        """Test include plans are parsed once per include parameter."""
+        self.view().compound_response(self.response)
+        self.view().compound_response(self.response)
+        self.assertTrue(self.view.jsonapi.parsed == 1)
+
+    def test_include_loaded_models(self):
+        """Test relationships loaded by the primary fetch are reused."""
+        view = self.view()
+        users = self.session.query(User).options(
+            joinedload(User.account)).all()
+        view.store_fetched_model(users)
+        response = view.compound_response(self.response)
+        self.assertTrue(self.batches == [])
+        self.assertTrue(response['included'] == [{'id': 1}, {'id': 2}])
+
+    def test_include_unloaded_models(self):
+        """Test lazy relationships are queried."""
+        view = self.view()
+        self.session.expire_all()
+        view.store_fetched_model(self.session.query(User).all())
+        view.compound_response(self.response)
+        self.assertTrue(len(self.batches) == 3)
+
+    def test_loader(self):
+        """Test fetched models prime the loader and misses are batched."""
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        view = self.view()
+        view.loader = Loader(
+            view.fetch_many, view.identity, view.normalize_key)
+        users = self.session.query(User).filter(User.id < 2).all()
+        view.store_fetched_model(users)
+
+        event.listen(self.session.get_bind(), 'before_cursor_execute', record)
+        self.assertTrue(view.loader.load(User, 1) is users[1])
+        self.assertTrue(view.loader.load(User, '1') is users[1])
+        self.assertTrue(statements == [])
+
+        accounts = view.loader.load_many(Account, [2, 1, 3])
+        self.assertTrue([account and account.id for account in accounts] == [
+            2, 1, None])
+        self.assertTrue(len(statements) == 1)
+
+
+class SortingJSONAPIQuery:
+
+    def filter(self, query, errors):
+        return query, []
+
+    def sort(self, query, errors):
+        return query.order_by(User.account_id.desc()), []
+
+
+class Item(Base):
+    __tablename__ = 'items'
+    id = Column('item_id', Integer, primary_key=True)
+    name = Column(String)
+
+
+class ItemJSONAPIQuery:
+
+    def __init__(self, *order_by):
+        self.order_by = order_by
+
+    def filter(self, query, errors):
+        return query, []
+
+    def sort(self, query, errors):
+        return query.order_by(*self.order_by), []
+
+
+class KeysetPaginationTestCase(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        class UsersView(UsersQueryView):
+            jsonapi = SortingJSONAPIQuery()
+            pagination_url = '/users'
+            query_options = {
+                'pagination': 'keyset', 'page_size': 2, 'count': 'exact'}
+            query_parameters = {}
+
+        self.view = UsersView
+
+    def get_page(self, link=None):
+        view = self.view()
+        if link:
+            view.query_parameters = dict(
+                parameter.split('=', 1) for parameter in
+                unquote(link.split('?', 1)[1]).split('&'))
+        query = view.apply_jsonapi_args(self.session.query(User))
+        models = view.trim_page(query.all())
+        response = view.paginate_response({})
+        return [model.id for model in models], response
+
+    def test_keyset_pagination(self):
+        """Test walking forwards and backwards with cursors."""
+        ids, response = self.get_page()
+        self.assertTrue(ids == [1, 3])
+        self.assertTrue(response['links']['prev'] is None)
+        self.assertTrue(response['meta'] == {'total': 5})
+
+        ids, response = self.get_page(response['links']['next'])
+        self.assertTrue(ids == [0, 2])
+        prev = response['links']['prev']
+
+        ids, response = self.get_page(response['links']['next'])
+        self.assertTrue(ids == [4])
+        self.assertTrue(response['links']['next'] is None)
+
+        ids, response = self.get_page(prev)
+        self.assertTrue(ids == [1, 3])
+        self.assertTrue(response['links']['prev'] is None)
+        self.assertTrue(response['links']['next'] is not None)
+
+    def test_invalid_cursor(self):
+        """Test an invalid cursor is reported."""
+        view = self.view()
+        view.query_parameters = {'page[cursor]': 'invalid'}
+        with self.assertRaises(ValueError) as context:
+            view.apply_jsonapi_args(self.session.query(User))
+        self.assertTrue(context.exception.args[0] == [{
+            'source': {'parameter': 'page[cursor]'},
+            'detail': 'Invalid pagination cursor.'}])
+
+    def test_renamed_column(self):
+        """Test cursors read columns mapped under another attribute name."""
+        self.session.add_all([Item(id=index) for index in range(3)])
+        self.session.commit()
+
+        class ItemsView(self.view):
+            jsonapi = ItemJSONAPIQuery(Item.id.desc())
+            model = Item
+
+        view = ItemsView()
+        query = view.apply_jsonapi_args(self.session.query(Item))
+        models = view.trim_page(query.all())
+        self.assertTrue([model.id for model in models] == [2, 1])
+        self.assertTrue(view.pagination_page['last'] == [1])
+
+    def test_expression_sort(self):
+        """Test sorting by an expression is reported."""
+        class UsersView(self.view):
+            jsonapi = ItemJSONAPIQuery(func.lower(User.name))
+
+        with self.assertRaises(ValueError) as context:
+            UsersView().apply_jsonapi_args(self.session.query(User))
+        self.assertTrue(
+            context.exception.args[0][0]['source'] == {'parameter': 'sort'})
+
+    def test_cursor(self):
+        """Test cursors round trip."""
+        cursor = encode_cursor('next', [1, 'a'])
+        self.assertTrue(decode_cursor(cursor) == ('next', [1, 'a']))
+
+    def test_invalid_cursor_value(self):
+        """Test a value the column type rejects raises "ValueError"."""
+        assert_raises(ValueError, coerce_value, Column(Numeric), 'invalid')
+
+
+class CountStrategyTestCase(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        class UsersView(UsersQueryView):
+            count_cache = NamespacedCache()
+            jsonapi = SortingJSONAPIQuery()
+            pagination_url = '/users'
+            query_parameters = {'page[offset]': '2', 'page[limit]': '2'}
+
+        class UpdateUserView(CountInvalidationMixin):
+            count_cache = UsersView.count_cache
+            model = User
+
+        self.view = UsersView
+        self.update_view = UpdateUserView
+
+    def get_page(self, count):
+        view = self.view()
+        view.query_options = {'count': count}
+        query = view.apply_jsonapi_args(self.session.query(User))
+        models = view.trim_page(query.all())
+        return [model.id for model in models], view.paginate_response({})
+
+    def test_has_more(self):
+        """Test "has_more" pages without a total."""
+        ids, response = self.get_page('has_more')
+        self.assertTrue(ids == [0, 2])
+        self.assertTrue('meta' not in response)
+        self.assertTrue(response['links'] == {
+            'first': '/users?page%5Boffset%5D=0&page%5Blimit%5D=2',
+            'prev': '/users?page%5Boffset%5D=0&page%5Blimit%5D=2',
+            'next': '/users?page%5Boffset%5D=4&page%5Blimit%5D=2'})
+
+    def test_estimate(self):
+        """Test "estimate" falls back to an exact count."""
+        ids, response = self.get_page('estimate')
+        self.assertTrue(response['meta'] == {'total': 5})
+        self.assertTrue(response['links']['last'] ==
+                        '/users?page%5Boffset%5D=4&page%5Blimit%5D=2')
+
+    def test_estimate_fallback(self):
+        """Test a failing plan with bound values falls back to a count."""
+        dialect = self.session.get_bind().dialect
+        dialect.name = 'postgresql'
+        try:
+            query = self.session.query(User).filter(
+                User.name.is_distinct_from('x :b'))
+            self.assertTrue(self.view().estimate_count(query) == 5)
+        finally:
+            del dialect.name
+
+    def test_cached(self):
+        """Test cached counts are reused until a write invalidates them."""
+        self.assertTrue(self.get_page('cached')[1]['meta'] == {'total': 5})
+        self.session.add(User(id=5, account_id=1))
+        self.session.commit()
+        self.assertTrue(self.get_page('cached')[1]['meta'] == {'total': 5})
+
+        self.update_view().invalidate_counts_after_save(None)
+        self.assertTrue(self.get_page('cached')[1]['meta'] == {'total': 6})
+
+
+class SparseFieldsetTestCase(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.session.expunge_all()
+
+        class UsersView(CompoundDocumentMixin):
+            model = User
+            query_options = {'eager_includes': True}
+            query_parameters = {
+                'fields[users]': 'name,unknown', 'fields[accounts]': 'id',
+                'include': 'account'}
+
+        self.view = UsersView
+
+    def test_primary_columns(self):
+        """Test only requested and key columns are loaded."""
+        view = self.view()
+        query = view.apply_sparse_fieldsets(self.session.query(User))
+        user = query.first()
+        self.assertTrue(inspect(user).unloaded == {'email'})
+        self.assertTrue(view.schema_args == {'fields': ['name', 'unknown']})
+
+    def test_included_columns(self):
+        """Test included relationships are eagerly loaded."""
+        view = self.view()
+        query = view.apply_sparse_fieldsets(self.session.query(User))
+        users = query.all()
+        self.assertTrue(all(
+            inspect(user.account).unloaded == {'name'} for user in users))
+
+        view.store_fetched_model(users)
+        self.assertTrue(view.include_loaded_models() == [
+            users[0].account, users[1].account])
+
+    def test_sparse_fields(self):
+        """Test parsing fieldset parameters."""
+        self.assertTrue(self.view().sparse_fields == {
+            'users': ['name', 'unknown'], 'accounts': ['id']})
+
+
+class Post(Base):
+    __tablename__ = 'posts'
+    id = Column(Integer, primary_key=True)
+    account_id = Column(Integer, index=True)
+    is_archived = Column(Boolean, default=False, nullable=False, index=True)
+
+
+class FilteringJSONAPIQuery:
+
+    def __init__(self, account_id):
+        self.account_id = account_id
+
+    def filter(self, query, errors):
+        return query.filter(Post.account_id == self.account_id), []
+
+
+class ArchiveTestCase(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        session = self.session
+        self.processed = processed = []
+
+        class PostsView(ArchivedFilterMixin, QueryMixin):
+            model = Post
+
+        class ArchivePostsView(BulkArchiveMixin, CountInvalidationMixin,
+                               QueryMixin, View):
+            count_cache = NamespacedCache()
+            jsonapi = FilteringJSONAPIQuery(0)
+            model = Post
+
+            def commit(self):
+                session.commit()
+
+            @pre_archive_all
+            def check_query(self, query):
+                processed.append('pre')
+                return query
+
+            @post_archive_all
+            def check_count(self, count):
+                processed.append(count)
+                return count
+
+        self.view = PostsView
+        self.archive_view = ArchivePostsView
+
+    def seed(self, session):
+        session.add_all([
+            Post(id=index, account_id=index % 2, is_archived=index == 0)
+            for index in range(6)])
+
+    def test_exclude_archived(self):
+        """Test fetch queries exclude archived rows by default."""
+        view = self.view()
+        query = view.exclude_archived(self.session.query(Post))
+        self.assertTrue([post.id for post in query] == [1, 2, 3, 4, 5])
+
+        view.include_archived = True
+        query = view.exclude_archived(self.session.query(Post))
+        self.assertTrue(query.count() == 6)
+
+    def test_archive_all(self):
+        """Test filtered rows are archived with one UPDATE."""
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+        event.listen(self.session.get_bind(), 'before_cursor_execute', record)
+
+        view = self.archive_view()
+        self.assertTrue(view.archive_all(self.session.query(Post)) == 2)
+        self.assertTrue(view.archived_count == 2)
+        self.assertTrue(self.processed == ['pre', 2])
+        self.assertTrue(len(statements) == 1)
+        self.assertTrue(statements[0].startswith('UPDATE posts'))
+
+        archived = self.session.query(Post.id).filter(Post.is_archived)
+        self.assertTrue(sorted(row.id for row in archived) == [0, 2, 4])
+        self.assertTrue(view.archive_all(self.session.query(Post)) == 0)
+
+
+class ParsingJSONAPIQuery:
+
+    def __init__(self):
+        self.parameters = {}
+        self.parsed = 0
+
+    def filter(self, query, errors):
+        self.parsed += 1
+        account = self.parameters.get('filter[account]')
+        if account is not None:
+            if not account.isdigit():
+                return query, [{'detail': 'Invalid account.'}]
+            query = query.filter(User.account_id == int(account))
+        name = self.parameters.get('filter[account.name]')
+        if name is not None:
+            query = query.join(User.account).filter(Account.name == name)
+        if 'filter[distinct]' in self.parameters:
+            query = query.filter(User.id > 0).distinct()
+        return query, []
+
+    def sort(self, query, errors):
+        if self.parameters.get('sort') == '-id':
+            return query.order_by(User.id.desc()), []
+        return query, []
+
+
+class QueryPlanTestCase(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        class UsersView(UsersQueryView):
+            jsonapi = ParsingJSONAPIQuery()
+            query_options = {'may_paginate': False}
+            query_parameters = {}
+            query_plans = LRUCache(maxsize=8)
+
+        self.view = UsersView
+
+    def get_ids(self, parameters, query=None):
+        view = self.view()
+        view.query_parameters = view.jsonapi.parameters = parameters
+        query = query or self.session.query(User)
+        return [user.id for user in view.apply_jsonapi_args(query)]
+
+    def test_cached_plan(self):
+        """Test filter and sort plans are parsed once per parameters."""
+        parameters = {'filter[account]': '1', 'sort': '-id', 'x': '1'}
+        self.assertTrue(self.get_ids(parameters) == [4, 2, 0])
+        self.assertTrue(self.get_ids(dict(parameters, x='2')) == [4, 2, 0])
+        query = self.session.query(User).filter(User.id > 0)
+        self.assertTrue(self.get_ids(parameters, query) == [4, 2])
+        self.assertTrue(self.view.jsonapi.parsed == 1)
+
+        self.assertTrue(self.get_ids({'filter[account]': '2'}) == [1, 3])
+        self.assertTrue(self.view.jsonapi.parsed == 2)
+
+    def test_cached_errors(self):
+        """Test invalid parameters are rejected from the cache."""
+        parameters = {'filter[account]': 'x'}
+        assert_raises(ValueError, self.get_ids, parameters)
+        assert_raises(ValueError, self.get_ids, parameters)
+        self.assertTrue(self.view.jsonapi.parsed == 1)
+
+    def test_uncacheable_plan(self):
+        """Test filters adding joins are parsed on every request."""
+        parameters = {'filter[account.name]': 'b'}
+        self.assertTrue(self.get_ids(parameters) == [1, 3])
+        self.assertTrue(self.get_ids(parameters) == [1, 3])
+        self.assertTrue(self.view.jsonapi.parsed == 2)
+
+    def test_uncacheable_query_state(self):
+        """Test filters changing other query state are not cached."""
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+        event.listen(self.session.get_bind(), 'before_cursor_execute', record)
+
+        parameters = {'filter[distinct]': '1'}
+        self.assertTrue(self.get_ids(parameters) == [1, 2, 3, 4])
+        self.assertTrue(self.get_ids(parameters) == [1, 2, 3, 4])
+        self.assertTrue(self.view.jsonapi.parsed == 2)
+        self.assertTrue(all(
+            statement.startswith('SELECT DISTINCT')
+            for statement in statements))
+
+    def test_missing_parameters(self):
+        """Test plans are not cached without the request's parameters."""
+        for _ in range(2):
+            view = self.view()
+            view.query_parameters = None
+            view.jsonapi.parameters = {'filter[account]': '1'}
+            view.apply_jsonapi_args(self.session.query(User))
+        self.assertTrue(self.view.jsonapi.parsed == 2)
+
+    def test_reused_plan(self):
+        """Test cached plans are applied without building a new plan."""
+        plans = []
+
+        class CountingView(self.view):
+            def make_query_plan(self, query, errors):
+                plans.append(query)
+                return super().make_query_plan(query, errors)
+
+        self.view = CountingView
+        parameters = {'filter[account]': '1', 'sort': '-id'}
+        self.assertTrue(self.get_ids(parameters) == [4, 2, 0])
+        self.assertTrue(self.get_ids(parameters) == [4, 2, 0])
+        self.assertTrue(len(plans) == 1)
+
+        CountingView.query_plans = None
+        self.assertTrue(self.get_ids(parameters) == [4, 2, 0])
+        self.assertTrue(len(plans) == 1)
@@ -0,0 +1,65 @@
+from unittest import TestCase
+
+import resourceful
+import subprocess
+import sys
+
+
+def imported_modules(statement):
+    """Return the modules imported by a statement in a fresh interpreter."""
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        stderr=subprocess.PIPE, check=True, universal_newlines=True)
+    modules = set()
+    for line in process.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            name = line.rsplit('|', 1)[1].strip()
+            if name != 'package':
+                modules.add(name)
+    return modules
+
+
+class InitTestCase(TestCase):
+
+    def test_lazy_attributes(self):
+        """Test public names resolve to their module's objects."""
+        from resourceful import aio, decorators, views
+        self.assertTrue(resourceful.View is views.View)
+        self.assertTrue(resourceful.pre_fetch is decorators.pre_fetch)
+        self.assertTrue(resourceful.AsyncView is aio.AsyncView)
+        self.assertTrue('ReadView' in dir(resourceful))
+
+    def test_lazy_submodules(self):
+        """Test submodules resolve as attributes without an import."""
+        statement = (
+            'import resourceful; '
+            'assert resourceful.decorators.tag_processor; '
+            'assert resourceful.views.View is resourceful.View')
+        subprocess.run([sys.executable, '-c', statement], check=True)
+
+    def test_unknown_attribute(self):
+        """Test accessing an undefined name raises AttributeError."""
+        self.assertTrue(not hasattr(resourceful, 'UnknownView'))
+
+    def test_import_package(self):
+        """Test importing the package does not import its modules."""
+        modules = imported_modules('import resourceful')
+        self.assertTrue('resourceful' in modules)
+        self.assertTrue(not {
+            module for module in modules
+            if module.startswith('resourceful.')})
+        self.assertTrue('asyncio' not in modules)
+
+    def test_import_views(self):
+        """Test importing the views does not import asyncio."""
+        modules = imported_modules('import resourceful.views')
+        self.assertTrue('resourceful.views' in modules)
+        self.assertTrue('resourceful.aio' not in modules)
+        self.assertTrue('asyncio' not in modules)
+
+    def test_import_jsonapi_extension(self):
+        """Test importing the jsonapi extension defers database imports."""
+        modules = imported_modules('import resourceful.extensions.jsonapi')
+        self.assertTrue('resourceful.extensions.jsonapi' in modules)
+        self.assertTrue('sqlalchemy' not in modules)
+        self.assertTrue('jsonapiquery' not in modules)
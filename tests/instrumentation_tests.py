@@ -0,0 +1,86 @@
+from unittest import TestCase
+
+import logging
+
+from resourceful.decorators import *
+from resourceful.instrumentation import *
+from resourceful.views import *
+
+
+class InstrumentedView(View):
+    timings = None
+
+    @pre_fetch(1)
+    def a(self, arg, **kwargs):
+        return arg + 1
+
+    @pre_fetch
+    def b(self, arg, **kwargs):
+        return arg + kwargs.get('step', 1)
+
+    def record_timing(self, timing):
+        if self.timings is None:
+            self.timings = []
+        self.timings.append(timing)
+
+
+class InstrumentationTestCase(TestCase):
+
+    def test_instrumentation(self):
+        """Test processors and stages are timed."""
+        records = []
+
+        class TestView(InstrumentedView):
+            instrumentation = Instrumentation([CallbackSink(records.append)])
+
+        view = TestView()
+        self.assertTrue(view.interleave('pre_fetch', 0, step=2) == 3)
+        self.assertTrue(view.interleave('post_fetch', 0) == 0)
+        self.assertTrue([(r.view, r.stage, r.processor) for r in records] == [
+            ('TestView', 'pre_fetch', 'a'), ('TestView', 'pre_fetch', 'b'),
+            ('TestView', 'pre_fetch', None)])
+        self.assertTrue(all(r.wall >= 0 and r.cpu >= 0 for r in records))
+        self.assertTrue(view.timings == records)
+
+    def test_compiled_instrumentation(self):
+        """Test compiled views are timed."""
+        sink = HistogramSink()
+
+        class TestView(InstrumentedView):
+            compiled_dispatch = True
+            instrumentation = Instrumentation([sink])
+
+        TestView().interleave('pre_fetch', 0)
+        TestView().interleave('pre_fetch', 0)
+        snapshot = sink.snapshot()
+        self.assertTrue(snapshot[('TestView', 'pre_fetch', 'a')]['count'] == 2)
+        self.assertTrue(snapshot[('TestView', 'pre_fetch', None)]['count'] == 2)
+
+    def test_disabled_instrumentation(self):
+        """Test views are not timed by default."""
+        view = InstrumentedView()
+        self.assertTrue(view.interleave('pre_fetch', 0) == 2)
+        self.assertTrue(view.timings is None)
+
+    def test_histogram_sink(self):
+        """Test timings are bucketed by wall time."""
+        sink = HistogramSink(buckets=(0.1, 1.0))
+        sink.record(Timing('V', 'pre_fetch', 'a', 0.05, 0.01))
+        sink.record(Timing('V', 'pre_fetch', 'a', 0.5, 0.2))
+        sink.record(Timing('V', 'pre_fetch', 'a', 2.0, 0.3))
+        histogram = sink.snapshot()[('V', 'pre_fetch', 'a')]
+        self.assertTrue(histogram['count'] == 3)
+        self.assertTrue(histogram['buckets'] == [1, 1, 1])
+        self.assertTrue(histogram['max'] == 2.0)
+        sink.clear()
+        self.assertTrue(sink.snapshot() == {})
+
+    def test_logging_sink(self):
+        """Test timings above the threshold are logged."""
+        logger = logging.getLogger('resourceful.tests')
+        sink = LoggingSink(logger=logger, threshold=0.1)
+        with self.assertLogs(logger, logging.INFO) as logs:
+            sink.record(Timing('V', 'pre_fetch', 'a', 0.01, 0.01))
+            sink.record(Timing('V', 'pre_fetch', 'b', 0.2, 0.01))
+        self.assertTrue(len(logs.output) == 1)
+        self.assertTrue('V.pre_fetch b' in logs.output[0])
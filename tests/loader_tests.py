@@ -0,0 +1,57 @@
+from unittest import TestCase
+
+from resourceful.loader import *
+
+
+class Model:
+
+    def __init__(self, id):
+        self.id = id
+
+
+class LoaderTestCase(TestCase):
+
+    def setUp(self):
+        self.fetches = fetches = []
+
+        def fetch_many(model, keys):
+            fetches.append(keys)
+            return [model(key) for key in keys if key < 10]
+
+        self.loader = Loader(fetch_many, lambda obj: obj.id)
+
+    def test_load_many(self):
+        """Test missing keys are fetched once in a single batch."""
+        models = self.loader.load_many(Model, [1, 2, 1, 20])
+        self.assertTrue([model and model.id for model in models] == [
+            1, 2, 1, None])
+        self.assertTrue(models[0] is models[2])
+        self.assertTrue(self.fetches == [[1, 2, 20]])
+
+        self.assertTrue(self.loader.load(Model, 2) is models[1])
+        self.assertTrue(self.loader.load(Model, 20) is None)
+        self.assertTrue(self.loader.load_many(Model, [2, 3])[0] is models[1])
+        self.assertTrue(self.fetches == [[1, 2, 20], [3]])
+
+    def test_prime(self):
+        """Test primed instances are not fetched."""
+        model = self.loader.prime(Model(1))
+        self.assertTrue((Model, 1) in self.loader)
+        self.assertTrue(self.loader.load(Model, 1) is model)
+        self.assertTrue(self.fetches == [])
+
+    def test_clear(self):
+        """Test clearing the map fetches keys again."""
+        self.loader.load(Model, 1)
+        self.loader.clear()
+        self.assertTrue(len(self.loader) == 0)
+        self.loader.load(Model, 1)
+        self.assertTrue(self.fetches == [[1], [1]])
+
+    def test_key(self):
+        """Test requested keys are normalized to instance identities."""
+        self.loader.key = lambda model, key: int(key)
+        model = self.loader.load(Model, '1')
+        self.assertTrue(model is not None and model.id == 1)
+        self.assertTrue(self.loader.load(Model, 1) is model)
+        self.assertTrue(self.fetches == [[1]])
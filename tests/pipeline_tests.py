@@ -0,0 +1,203 @@
+from nose.tools import assert_raises
+from unittest import TestCase
+
+from resourceful.decorators import *
+from resourceful.pipeline import *
+from resourceful.views import *
+
+import threading
+
+
+class PipelineTestCase(TestCase):
+
+    def test_pipeline_stages(self):
+        """Test known stages are stored as tuples."""
+        def a(self, arg):
+            return arg
+
+        pipeline = Pipeline({'pre_fetch': [a]})
+        self.assertTrue(pipeline.pre_fetch == (a,))
+        self.assertTrue(pipeline['pre_fetch'] == (a,))
+        self.assertTrue(pipeline.post_dump == ())
+        self.assertTrue(list(pipeline) == ['pre_fetch'])
+        self.assertTrue('pre_fetch' in pipeline)
+        self.assertTrue('post_dump' not in pipeline)
+
+    def test_pipeline_custom_stage(self):
+        """Test custom stages are stored in the extra mapping."""
+        def a(self, arg):
+            return arg
+
+        pipeline = Pipeline({'custom': [a]})
+        self.assertTrue(pipeline['custom'] == (a,))
+        self.assertTrue(pipeline['unknown'] == ())
+        self.assertTrue(pipeline.items() == [('custom', (a,))])
+        self.assertTrue(pipeline.stages['custom'] == (a,))
+        self.assertTrue(pipeline.stages['pre_fetch'] == ())
+        self.assertTrue('extra' not in pipeline.stages)
+
+    def test_pipeline_immutable(self):
+        """Test a pipeline can not be modified."""
+        pipeline = Pipeline()
+        assert_raises(AttributeError, setattr, pipeline, 'pre_fetch', ())
+
+        def set_extra():
+            pipeline.extra['a'] = ()
+        assert_raises(TypeError, set_extra)
+
+        def set_stage():
+            pipeline.stages['a'] = ()
+        assert_raises(TypeError, set_stage)
+
+    def test_view_pipeline(self):
+        """Test processors are compiled at class creation."""
+        class TestView(View):
+            @pre_fetch(1)
+            def a(self, arg):
+                return arg + ['a']
+
+            @pre_fetch(2)
+            def b(self, arg):
+                return arg + ['b']
+
+        self.assertTrue(isinstance(TestView.processors, Pipeline))
+        self.assertTrue(TestView.processors.pre_fetch == (
+            TestView.b, TestView.a))
+        self.assertTrue(TestView().interleave('pre_fetch', []) == ['b', 'a'])
+        self.assertTrue(TestView().interleave('post_fetch', 1) == 1)
+
+    def test_view_pipeline_inheritance(self):
+        """Test subclasses compile their own pipeline."""
+        class ParentView(View):
+            @post_dump
+            def a(self, arg, **kwargs):
+                return arg + [kwargs]
+
+        class ChildView(ParentView):
+            @post_dump(-1)
+            def b(self, arg, **kwargs):
+                return arg + ['b']
+
+        self.assertTrue(len(ParentView.processors.post_dump) == 1)
+        self.assertTrue(len(ChildView.processors.post_dump) == 2)
+        self.assertTrue(
+            ChildView().interleave('post_dump', [], x=1) == [{'x': 1}, 'b'])
+
+    def test_view_custom_stage_names(self):
+        """Test custom stages named like pipeline attributes."""
+        class TestView(View):
+            extra = tag_processor(lambda self, arg: arg + ['a'], 'extra')
+            items = tag_processor(lambda self, arg: arg + ['b'], 'items')
+
+        self.assertTrue(TestView().interleave('extra', []) == ['a'])
+        self.assertTrue(TestView().interleave('items', []) == ['b'])
+        self.assertTrue(TestView().interleave('__class__', 1) == 1)
+
+    def test_view_add_processor(self):
+        """Test attached processors recompile the subclass pipelines."""
+        class ParentView(View):
+            @pre_fetch
+            def a(self, arg):
+                return arg + ['a']
+
+        class ChildView(ParentView):
+            compiled_dispatch = True
+
+        @pre_fetch(-1)
+        def b(self, arg):
+            return arg + ['b']
+
+        ParentView.add_processor(b)
+        self.assertTrue('processors' in vars(ChildView))
+        self.assertTrue(ParentView().interleave('pre_fetch', []) == ['a', 'b'])
+        self.assertTrue(ChildView().interleave('pre_fetch', []) == ['a', 'b'])
+        self.assertTrue(View.processors.pre_fetch == ())
+        assert_raises(TypeError, ParentView.add_processor, lambda s, a: a)
+
+    def test_view_add_processor_concurrently(self):
+        """Test dispatch sees complete chains while views are registered."""
+        class BaseView(View):
+            @pre_fetch(1000)
+            def start(self, arg):
+                return arg + [0]
+
+        def make_processor(index):
+            def processor(self, arg):
+                return arg + [index]
+            processor.__name__ = 'p{}'.format(index)
+            return pre_fetch(-index)(processor)
+
+        errors = []
+
+        def register(offset):
+            for index in range(offset, 40, 4):
+                type('View{}'.format(index), (BaseView, ), {})
+                BaseView.add_processor(make_processor(index + 1))
+
+        def dispatch():
+            while any(thread.is_alive() for thread in registrars):
+                for view in [BaseView] + BaseView.__subclasses__():
+                    chain = view().interleave('pre_fetch', [])
+                    if chain != sorted(chain) or chain[0] != 0:
+                        errors.append(chain)
+
+        registrars = [threading.Thread(target=register, args=(offset, ))
+                      for offset in range(4)]
+        threads = registrars + [
+            threading.Thread(target=dispatch) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(errors == [])
+        expected = list(range(41))
+        self.assertTrue(BaseView().interleave('pre_fetch', []) == expected)
+        for view in BaseView.__subclasses__():
+            self.assertTrue(view().interleave('pre_fetch', []) == expected)
+
+    def test_compile_stage(self):
+        """Test generated stage functions forward keyword arguments."""
+        def a(self, arg):
+            return arg + ['a']
+
+        def b(self, arg, **kwargs):
+            return arg + [kwargs]
+
+        stage = compile_stage('pre-fetch', (a, b))
+        self.assertTrue(stage.__name__ == 'pre-fetch')
+        self.assertTrue(stage(None, [], {}) == ['a', {}])
+        assert_raises(TypeError, stage, None, [], {'x': 1})
+        self.assertTrue(compile_stage('pre_fetch', ()) is None)
+
+    def test_compiled_dispatch(self):
+        """Test compiled dispatch matches the default interleave."""
+        class TestView(View):
+            @pre_fetch
+            def a(self, arg, **kwargs):
+                return arg + ['a', kwargs]
+
+            @pre_fetch(1)
+            def b(self, arg, **kwargs):
+                return arg + ['b']
+
+            @post_fetch
+            def c(self, arg):
+                return arg + ['c']
+
+        class CompiledView(TestView):
+            compiled_dispatch = True
+
+        class UncompiledView(CompiledView):
+            compiled_dispatch = False
+
+        self.assertTrue(CompiledView.interleave.__compiled__)
+        self.assertTrue(UncompiledView.interleave is View.interleave)
+        for stage, kwargs in [
+                ('pre_fetch', {}), ('pre_fetch', {'id': 1}),
+                ('post_fetch', {}), ('post_dump', {})]:
+            expected = TestView().interleave(stage, [], **kwargs)
+            self.assertTrue(
+                CompiledView().interleave(stage, [], **kwargs) == expected)
+            self.assertTrue(
+                UncompiledView().interleave(stage, [], **kwargs) == expected)
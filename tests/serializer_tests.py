@@ -1,8 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
 from nose.tools import assert_raises
 from unittest import TestCase
 
 from resourceful.serializer import *
 
+import gc
+import weakref
+
 
 class SerializerTestCase(TestCase):
 
@@ -16,6 +20,56 @@ class SerializerTestCase(TestCase):
         """Test fetching an undefined serializer."""
         assert_raises(KeyError, get_serializer, 'ABC')
 
+    def test_get_serializer_qualified_name(self):
+        """Test fetching same-named serializers by qualified name."""
+        class TestSerializer(Serializer):
+            pass
+        other = type(
+            'TestSerializer', (Serializer, ), {'__module__': 'other.package'})
+
+        self.assertTrue(
+            get_serializer(qualified_name(TestSerializer)) is TestSerializer)
+        self.assertTrue(get_serializer('other.package.TestSerializer') is other)
+
+    def test_resolve_serializer(self):
+        """Test resolving a shared serializer instance from a resource."""
+        class Model:
+            pass
+
+        class SubModel(Model):
+            pass
+
+        class TestSerializer(Serializer):
+            model = Model
+            resource_type = 'models'
+
+        serializer = resolve_serializer(Model)
+        self.assertTrue(type(serializer) is TestSerializer)
+        self.assertTrue(resolve_serializer(Model()) is serializer)
+        self.assertTrue(resolve_serializer(SubModel) is serializer)
+        self.assertTrue(resolve_serializer('models') is serializer)
+        self.assertTrue(
+            resolve_serializer(qualified_name(TestSerializer)) is serializer)
+
+    def test_resolve_unknown_serializer(self):
+        """Test resolving an unregistered resource."""
+        assert_raises(KeyError, resolve_serializer, object)
+        assert_raises(KeyError, resolve_serializer, 'unknown-type')
+
+    def test_serializer_registry_weak_references(self):
+        """Test dynamically created serializers are not kept alive."""
+        class Model:
+            pass
+
+        TestSerializer = type(
+            'DynamicSerializer', (Serializer, ), {'model': Model})
+        resolve_serializer(Model)
+        reference = weakref.ref(TestSerializer)
+        del TestSerializer
+        gc.collect()
+        self.assertTrue(reference() is None)
+        assert_raises(KeyError, resolve_serializer, Model)
+
     def test_serializer_deserialize_all(self):
         """Test calling deserialize_all method."""
         class TestSerializer(Serializer):
@@ -37,3 +91,89 @@ class SerializerTestCase(TestCase):
         self.assertTrue(model == 'test')
         self.assertTrue(many is True)
         self.assertTrue(kwargs == {'a': 1, 'b': 2})
+
+    def test_serializer_make_schema(self):
+        """Test schema instances are cached per field set and options."""
+        class Schema:
+            def __init__(self, **kwargs):
+                self.kwargs = kwargs
+
+        class TestSerializer(Serializer):
+            schema = Schema
+            schema_cache = SchemaCache(maxsize=2)
+
+        serializer = TestSerializer()
+        schema = serializer.make_schema(['b', 'a'], many=True, x=[1])
+        self.assertTrue(schema.kwargs == {
+            'many': True, 'only': ('b', 'a'), 'x': [1]})
+        self.assertTrue(
+            serializer.make_schema(['a', 'b'], many=True, x=[1]) is schema)
+        self.assertTrue(serializer.make_schema(['a'], many=True) is not schema)
+        self.assertTrue(serializer.make_schema(['a', 'b']) is not schema)
+
+        info = serializer.schema_cache.info()
+        self.assertTrue(info['hits'] == 1)
+        self.assertTrue(info['misses'] == 3)
+        self.assertTrue(info['size'] == 2)
+
+    def test_serializer_make_schema_unhashable(self):
+        """Test unhashable schema arguments bypass the cache."""
+        class TestSerializer(Serializer):
+            schema = dict
+            schema_cache = SchemaCache()
+
+        serializer = TestSerializer()
+        schema = serializer.make_schema(context=object)
+        self.assertTrue(schema == {'many': False, 'context': object})
+        unhashable = serializer.make_schema(context=bytearray())
+        self.assertTrue(
+            serializer.make_schema(context=bytearray()) is not unhashable)
+        self.assertTrue(serializer.schema_cache.info()['size'] == 1)
+
+    def test_serializer_serialize_all_parallel(self):
+        """Test serializing chunks on a worker pool in order."""
+        class TestSerializer(Serializer):
+            parallel_executor = ThreadPoolExecutor(4)
+            parallel_threshold = 10
+            parallel_chunk_size = 3
+
+            def serialize(self, models, many, **kwargs):
+                self.calls.append(list(models))
+                return [model * kwargs['factor'] for model in models]
+
+        serializer = TestSerializer()
+        serializer.calls = []
+        self.assertTrue(
+            serializer.serialize_all(list(range(9)), factor=2) ==
+            [model * 2 for model in range(9)])
+        self.assertTrue(len(serializer.calls) == 1)
+
+        serializer.calls = []
+        self.assertTrue(
+            serializer.serialize_all(list(range(10)), factor=2) ==
+            [model * 2 for model in range(10)])
+        self.assertTrue(len(serializer.calls) == 4)
+
+    def test_serializer_serialize_all_parallel_error(self):
+        """Test a failed chunk raises from serialize_all."""
+        class TestSerializer(Serializer):
+            parallel_executor = ThreadPoolExecutor(2)
+            parallel_threshold = 1
+            parallel_chunk_size = 2
+
+            def serialize(self, models, many, **kwargs):
+                if 3 in models:
+                    raise ValueError(models)
+                return models
+
+        assert_raises(
+            ValueError, TestSerializer().serialize_all, list(range(6)))
+
+    def test_serializer_merge_chunks(self):
+        """Test merging list, document and unknown chunks."""
+        serializer = Serializer()
+        self.assertTrue(serializer.merge_chunks([[1], [2, 3]]) == [1, 2, 3])
+        self.assertTrue(serializer.merge_chunks([
+            {'data': [1], 'jsonapi': {'version': '1.0'}}, {'data': [2, 3]}
+        ]) == {'data': [1, 2, 3], 'jsonapi': {'version': '1.0'}})
+        assert_raises(TypeError, serializer.merge_chunks, [(1, ), (2, )])
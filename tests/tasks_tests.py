@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+from resourceful.tasks import *
+
+import threading
+
+
+class TaskRunnerTestCase(TestCase):
+
+    def test_synchronous(self):
+        """Test synchronous runners run tasks in the calling thread."""
+        calls = []
+        runner = TaskRunner(synchronous=True)
+        self.assertTrue(runner.submit(calls.append, 1) is None)
+        self.assertTrue(calls == [1])
+
+    def test_flush(self):
+        """Test flushing waits for the pending tasks."""
+        calls = []
+        runner = TaskRunner(max_workers=2)
+        futures = [runner.submit(calls.append, index) for index in range(5)]
+        self.assertTrue(all(future is not None for future in futures))
+        self.assertTrue(runner.flush(timeout=5))
+        self.assertTrue(sorted(calls) == [0, 1, 2, 3, 4])
+        runner.shutdown()
+
+    def test_backpressure(self):
+        """Test tasks run in the caller once the pool is saturated."""
+        release = threading.Event()
+        threads = []
+        runner = TaskRunner(max_workers=1, max_pending=1)
+        self.assertTrue(runner.submit(release.wait, 5) is not None)
+        self.assertTrue(runner.submit(
+            lambda: threads.append(threading.current_thread())) is None)
+        self.assertTrue(threads == [threading.current_thread()])
+        release.set()
+        self.assertTrue(runner.flush(timeout=5))
+        self.assertTrue(runner.submit(release.wait, 5) is not None)
+        runner.shutdown()
+
+    def test_error_reporting(self):
+        """Test task exceptions are passed to the error callback."""
+        errors = []
+
+        def fail():
+            raise ValueError('failed')
+
+        runner = TaskRunner(max_workers=1, on_error=errors.append)
+        runner.submit(fail)
+        runner.flush(timeout=5)
+        runner.shutdown()
+        self.assertTrue(len(errors) == 1)
+        self.assertTrue(isinstance(errors[0], ValueError))
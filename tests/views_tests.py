@@ -35,3 +35,79 @@ class ViewsTestCase(TestCase):
         """Test DeleteView HTTP interactions."""
         self.assertTrue(DeleteView._method == 'DELETE')
         self.assertTrue(DeleteView._code == 204)
+
+    def test_bulk_views(self):
+        """Test bulk view HTTP interactions."""
+        self.assertTrue(BulkCreateView._method == 'POST')
+        self.assertTrue(BulkUpdateView._method == 'PUT')
+        self.assertTrue(BulkDeleteView._method == 'DELETE')
+        self.assertTrue(BulkDeleteView._code == 204)
+
+    def test_bulk_create_view(self):
+        """Test a batch is loaded, saved and committed once."""
+        calls = []
+
+        class TestSerializer:
+            def deserialize_all(self, forms):
+                calls.append(('deserialize_all', forms))
+                return [dict(form) for form in forms]
+
+            def serialize_all(self, models):
+                return {'data': models}
+
+        class TestView(BulkCreateView):
+            serializer = TestSerializer()
+
+            def save_all_action(self, models):
+                calls.append(('save_all_action', models))
+
+            def commit(self):
+                calls.append(('commit', ))
+
+            @pre_load
+            def a(self, form):
+                return {'name': form['name'].upper()}
+
+            @pre_save
+            def b(self, model):
+                model['saved'] = True
+                return model
+
+            @pre_save_all
+            def c(self, models):
+                calls.append(('pre_save_all', len(models)))
+                return models
+
+            @post_save_all
+            def d(self, models):
+                calls.append(('post_save_all', len(models)))
+                return models
+
+            @post_dump
+            def e(self, response):
+                response['meta'] = {'total': len(response['data'])}
+                return response
+
+        view = TestView()
+        data = view.load_all([{'name': 'a'}, {'name': 'b'}])
+        models = view.save_all(data)
+        self.assertTrue(models == [
+            {'name': 'A', 'saved': True}, {'name': 'B', 'saved': True}])
+        self.assertTrue([call[0] for call in calls] == [
+            'deserialize_all', 'pre_save_all', 'save_all_action', 'commit',
+            'post_save_all'])
+        self.assertTrue(view.dump_all(models)['meta'] == {'total': 2})
+
+    def test_bulk_delete_view(self):
+        """Test a batch is deleted and committed once."""
+        calls = []
+
+        class TestView(BulkDeleteView):
+            def delete_all_action(self, models):
+                calls.append(('delete_all_action', models))
+
+            def commit(self):
+                calls.append(('commit', ))
+
+        self.assertTrue(TestView().save_all([1, 2]) is None)
+        self.assertTrue(calls == [('delete_all_action', [1, 2]), ('commit', )])